@@ -13,7 +13,7 @@ import random
 import importlib
 import folder_paths
 import node_helpers
-import hashlib
+from .file_fingerprint import file_hash
 from folder_paths import get_filename_list, get_full_path, models_dir
 import nodes
 from pathlib import Path
@@ -750,11 +750,8 @@ class CivitAIModelSelectorSD15:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAIModelSelectorSDXL:
@@ -852,11 +849,8 @@ class CivitAIModelSelectorSDXL:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAIModelSelectorFLUX_D:
@@ -953,11 +947,8 @@ class CivitAIModelSelectorFLUX_D:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAIModelSelectorFLUX_S:
@@ -1054,11 +1045,8 @@ class CivitAIModelSelectorFLUX_S:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAIModelSelectorPony:
@@ -1155,11 +1143,8 @@ class CivitAIModelSelectorPony:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 class CivitAILoraSelectorSD15:
     @classmethod
@@ -1302,11 +1287,8 @@ class CivitAILoraSelectorSD15:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAILoraSelectorSDXL:
@@ -1450,11 +1432,8 @@ class CivitAILoraSelectorSDXL:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 class CivitAILoraSelectorPONY:
@@ -1598,11 +1577,8 @@ class CivitAILoraSelectorPONY:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
 
 
 
@@ -1747,8 +1723,5 @@ class CivitAILoraSelectorHunyuan:
         if not os.path.exists(image_path):
             return ""
         
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        m.update(image.encode('utf-8'))
-        return m.digest().hex()
\ No newline at end of file
+        # Hashed once per file version, unchanged files skip hashing entirely
+        return file_hash(image_path) + image
\ No newline at end of file
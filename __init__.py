@@ -77,6 +77,7 @@ from .ffmpeg_combine_video_audio import CombineVideoAudio
 from .images_merger_horizontal import MergeImagesHorizontally
 from .images_merger_vertical import MergeImagesVertically
 from .ollama_talk import OllamaTalk
+from .ollama_talk_batch import OllamaTalkBatch
 from .ollama_image_vision import OllamaImageVision, OllamaVisionPromptSelector
 from .ollama_config_selector import OllamaConfig
 from .ollama_system_persona import OllamaSystemPersonaSelector
@@ -88,6 +89,8 @@ from .anything_to_int import AnythingToInt
 from .anything_to_float import AnythingToFloat
 from .add_line_numbers import AddLineNumbers
 from .ffmpeg_convert import ConvertVideo
+from .ffmpeg_benchmark import FFmpegBenchmark
+from .ffmpeg_video_session import AppendFramesToVideoSession, FinalizeVideoSession
 
 # from .hiresfix import HiResFix
 # from .show_images import ImageBlend
@@ -164,7 +167,7 @@ from .audio_preview import AudioPreview
 from .style_selector import StyleSelector
 
 # from .switches import ConditionalSwitch
-from .split_image import SplitImageGrid, ReassembleImageGrid
+from .split_image import SplitImageGrid, ReassembleImageGrid, SplitImageTiles, ReassembleImageTiles
 
 # from .video_text_generator import VideoTextGenerator
 # from .run_workflow_from_api import ExecuteWorkflowNode, ApiDynamicTextInputs
@@ -190,6 +193,8 @@ NODE_CLASS_MAPPINGS = {
     "Bjornulf_LoadCivitAILinks": LoadCivitAILinks,
     "Bjornulf_SplitImageGrid": SplitImageGrid,
     "Bjornulf_ReassembleImageGrid": ReassembleImageGrid,
+    "Bjornulf_SplitImageTiles": SplitImageTiles,
+    "Bjornulf_ReassembleImageTiles": ReassembleImageTiles,
     "Bjornulf_StyleSelector": StyleSelector,
     "Bjornulf_OllamaVisionPromptSelector": OllamaVisionPromptSelector,
     "Bjornulf_AudioPreview": AudioPreview,
@@ -274,6 +279,9 @@ NODE_CLASS_MAPPINGS = {
     # "Bjornulf_ollamaLoader": ollamaLoader, OBSOLETE
     "Bjornulf_FFmpegConfig": FFmpegConfig,
     "Bjornulf_ConvertVideo": ConvertVideo,
+    "Bjornulf_FFmpegBenchmark": FFmpegBenchmark,
+    "Bjornulf_AppendFramesToVideoSession": AppendFramesToVideoSession,
+    "Bjornulf_FinalizeVideoSession": FinalizeVideoSession,
     "Bjornulf_AddLineNumbers": AddLineNumbers,
     "Bjornulf_TextToAnything": TextToAnything,
     "Bjornulf_AnythingToText": AnythingToText,
@@ -285,6 +293,7 @@ NODE_CLASS_MAPPINGS = {
     "Bjornulf_OllamaSystemJobSelector": OllamaSystemJobSelector,
     "Bjornulf_OllamaImageVision": OllamaImageVision,
     "Bjornulf_OllamaTalk": OllamaTalk,
+    "Bjornulf_OllamaTalkBatch": OllamaTalkBatch,
     "Bjornulf_MergeImagesHorizontally": MergeImagesHorizontally,
     "Bjornulf_MergeImagesVertically": MergeImagesVertically,
     "Bjornulf_CombineVideoAudio": CombineVideoAudio,
@@ -370,6 +379,8 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "Bjornulf_StyleSelector": "🎨📜 Style Selector (🎲 or ♻ or ♻📑) + Civitai urn",
     "Bjornulf_ReassembleImageGrid": "🖼📹🔨 Reassemble Image/Video Grid",
     "Bjornulf_SplitImageGrid": "🖼📹🔪 Split Image/Video Grid",
+    "Bjornulf_SplitImageTiles": "🖼📹🔪 Split Image/Video into tiles (batch)",
+    "Bjornulf_ReassembleImageTiles": "🖼📹🔨 Reassemble Image/Video tiles (feathered)",
     "Bjornulf_SaveTmpAudio": "💾🔊 Save Audio (tmp_api.wav/mp3) ⚠️💣",
     "Bjornulf_SaveTmpVideo": "💾📹 Save Video (tmp_api.mp4/mkv/webm) ⚠️💣",
     "Bjornulf_AudioPreview": "🔊▶ Audio Preview (Audio player)",
@@ -452,6 +463,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "Bjornulf_ShowJson": "👁 Show (JSON)",
     "Bjornulf_ShowStringText": "👁 Show (String/Text)",
     "Bjornulf_OllamaTalk": "🦙💬 Ollama Talk",
+    "Bjornulf_OllamaTalkBatch": "🦙💬 Ollama Talk (Batch)",
     "Bjornulf_OllamaImageVision": "🦙👁 Ollama Vision",
     "Bjornulf_OllamaConfig": "🦙 Ollama Configuration ⚙",
     "Bjornulf_XTTSConfig": "🔊 TTS Configuration ⚙",
@@ -467,6 +479,9 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "Bjornulf_AddLineNumbers": "🔢 Add line numbers",
     "Bjornulf_FFmpegConfig": "⚙📹 FFmpeg Configuration 📹⚙",
     "Bjornulf_ConvertVideo": "📹➜📹 Convert Video (FFmpeg)",
+    "Bjornulf_FFmpegBenchmark": "⏱📹 FFmpeg Encoder Benchmark",
+    "Bjornulf_AppendFramesToVideoSession": "🖼➕📹 Append frames to video session (FFmpeg)",
+    "Bjornulf_FinalizeVideoSession": "📹✅ Finalize video session (FFmpeg)",
     "Bjornulf_VideoDetails": "📹🔍 Video details (FFmpeg) ⚙",
     "Bjornulf_WriteText": "✒ Write Text",
     "Bjornulf_MergeImagesHorizontally": "🖼🖼 Merge Images/Videos 📹📹 (Horizontally)",
@@ -4,15 +4,18 @@ import os
 import subprocess
 from datetime import datetime
 import math
-from PIL import Image
 # import logging
-import torchvision.transforms as transforms
+from .ffmpeg_probe import probe
+from .frame_reader import read_video_frames
 
 class AudioVideoSync:
     """
     ComfyUI custom node for synchronizing audio and video with configurable speed adjustments.
     Supports both video files and image sequences as input, as well as audio files or AUDIO objects.
     """
+
+    # Frames converted per write when piping images to ffmpeg
+    PIPE_CHUNK_FRAMES = 16
     
     def __init__(self):
         """Initialize the AudioVideoSync node."""
@@ -63,6 +66,7 @@ class AudioVideoSync:
                     "max": 120.0,
                     "step": 0.1
                 }),
+                "save_sync_video": ("BOOLEAN", {"default": True}),
             }
         }
 
@@ -96,76 +100,49 @@ class AudioVideoSync:
         else:
             raise ValueError("Invalid audio input format")
 
-    def ffprobe_run(self, cmd):
-        """Run ffprobe command and return the output."""
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        return result.stdout.strip()
-
     def get_video_info(self, video_path):
         """Get video duration, fps, and frame count."""
-        duration = float(self.ffprobe_run([
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]))
-
-        fps_str = self.ffprobe_run([
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=r_frame_rate',
-            '-of', 'csv=p=0',
-            video_path
-        ])
-        fps = float(eval(fps_str)) if '/' in fps_str else float(fps_str)
-
-        frame_count = int(self.ffprobe_run([
-            'ffprobe', '-v', 'error',
-            '-count_packets',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=nb_read_packets',
-            '-of', 'csv=p=0',
-            video_path
-        ]))
-
-        return duration, fps, frame_count
-
-    def process_images_to_video(self, IMAGES, fps):
-        """Convert image sequence to video."""
+        info = probe(video_path)
+        return info.duration, info.fps, info.frame_count
+
+    def process_images_to_video(self, IMAGES, fps, output_path=None):
+        """Convert image sequence to video, piping raw frames to ffmpeg stdin."""
         timestamp = self.generate_timestamp()
-        temp_dir = os.path.join(self.temp_dir, f"frames_{timestamp}")
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        # Save frames
-        frame_paths = []
-        for i, img in enumerate(IMAGES):
-            if isinstance(img, torch.Tensor):
-                if img.dim() == 4:
-                    img = img.squeeze(0)
-                img = (img * 255).byte().cpu().numpy()
-                img = Image.fromarray(img)
-            
-            frame_path = os.path.join(temp_dir, f"frame_{i:05d}.png")
-            img.save(frame_path)
-            frame_paths.append(frame_path)
+        height, width = IMAGES.shape[1], IMAGES.shape[2]
 
         # Create video
-        output_path = os.path.join(self.temp_dir, f"video_{timestamp}.mp4")
-        subprocess.run([
+        if output_path is None:
+            output_path = os.path.join(self.temp_dir, f"video_{timestamp}.mp4")
+        ffmpeg_cmd = [
             'ffmpeg', '-y',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}',
             '-framerate', str(fps),
-            '-i', os.path.join(temp_dir, 'frame_%05d.png'),
+            '-i', '-',
             '-c:v', 'libx264',
             '-pix_fmt', 'yuv420p',
             '-preset', 'medium',
             '-crf', '19',
             output_path
-        ], check=True)
-
-        # Cleanup
-        for path in frame_paths:
-            os.remove(path)
-        os.rmdir(temp_dir)
+        ]
+        process = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE)
+        try:
+            for start in range(0, IMAGES.shape[0], self.PIPE_CHUNK_FRAMES):
+                chunk = IMAGES[start:start + self.PIPE_CHUNK_FRAMES, :, :, :3]
+                chunk = (chunk.clamp(0, 1) * 255).byte().cpu().contiguous()
+                process.stdin.write(chunk.numpy().tobytes())
+        except BrokenPipeError:
+            # ffmpeg exited early, the return code below carries the error
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, ffmpeg_cmd)
 
         return output_path
 
@@ -228,6 +205,32 @@ class AudioVideoSync:
 
         return os.path.abspath(output_path)
 
+    def retime_frame_indices(self, frame_count, original_duration, target_duration, max_speedup, max_slowdown):
+        """
+        Frame indices reproducing create_sync_video directly in tensor space.
+
+        Speed changes keep the frame rate and drop or duplicate frames (like setpts),
+        the repeat case tiles the whole sequence.
+        """
+        frames = torch.arange(frame_count)
+
+        if target_duration > original_duration:
+            speed_ratio = original_duration / target_duration
+            if speed_ratio < max_slowdown:
+                # Repeat video if slowdown would exceed limit
+                repeat_count = math.ceil(target_duration / original_duration)
+                return frames.repeat(repeat_count)
+            speed = speed_ratio
+        else:
+            speed_ratio = original_duration / target_duration
+            if abs(speed_ratio - 1.0) <= 0.1:
+                return frames
+            speed = min(speed_ratio, max_speedup)
+
+        new_frame_count = max(1, round(frame_count / speed))
+        indices = torch.floor(torch.arange(new_frame_count, dtype=torch.float64) * speed).long()
+        return indices.clamp_(max=frame_count - 1)
+
     def process_audio(self, audio_tensor, sample_rate, target_duration, original_duration,
                      max_speedup, max_slowdown):
         """Process audio to match video duration."""
@@ -301,52 +304,54 @@ class AudioVideoSync:
             
         return {'waveform': waveform, 'sample_rate': sample_rate}
 
-    def extract_frames(self, video_path):
-        """Extract all frames of the video as a tensor."""
-        temp_dir = os.path.join(self.temp_dir, "temp_frames")
-        os.makedirs(temp_dir, exist_ok=True)
-
-        # Clear existing files to avoid mixing frames from previous runs
-        for file in os.listdir(temp_dir):
-            os.remove(os.path.join(temp_dir, file))
-
-        # Extract frames using FFmpeg
-        subprocess.run([
-            'ffmpeg', '-y', '-i', video_path, os.path.join(temp_dir, 'frame_%05d.png')
-        ], check=True)  # Added '-y' to overwrite without prompting
-
-        # Load frames and convert to tensor
-        frames = []
-        frame_files = sorted(os.listdir(temp_dir))
-        transform = transforms.Compose([
-            transforms.ToTensor(),
-            transforms.Lambda(lambda x: x * 255)
-        ])
+    def extract_frames(self, video_path, frame_count=None):
+        """Extract all frames of the video as a uint8 tensor of shape (B, H, W, C), in memory."""
+        return read_video_frames(video_path, frame_count)
 
-        for frame_file in frame_files:
-            image = Image.open(os.path.join(temp_dir, frame_file)).convert('RGB')
-            frame_tensor = transform(image)
-            frames.append(frame_tensor)
+    def sync_images(self, IMAGES, AUDIO, audio_duration, output_fps,
+                    max_speedup, max_slowdown, save_sync_video):
+        """Synchronize an IMAGES batch without decoding anything, the video file is only written if requested."""
+        original_frame_count = len(IMAGES)
+        original_duration = original_frame_count / output_fps
 
-        # Stack frames into a single tensor
-        frames_tensor = torch.stack(frames)
+        indices = self.retime_frame_indices(
+            original_frame_count, original_duration, audio_duration, max_speedup, max_slowdown
+        )
+        sync_images = IMAGES[indices.to(IMAGES.device)]
+        sync_frame_count = len(sync_images)
+        sync_video_duration = sync_frame_count / output_fps
 
-        # Ensure correct format (B, C, H, W)
-        if frames_tensor.dim() == 3:
-            frames_tensor = frames_tensor.unsqueeze(0)
+        sync_video_path = ""
+        if save_sync_video:
+            output_path = os.path.join(self.sync_video_dir, f"sync_video_{self.generate_timestamp()}.mp4")
+            sync_video_path = os.path.abspath(self.process_images_to_video(sync_images, output_fps, output_path))
 
-        # Convert to uint8
-        frames_tensor = frames_tensor.byte()
+        # Process and save audio, getting consistent AUDIO format back
+        sync_audio = self.save_audio(
+            AUDIO['waveform'], AUDIO['sample_rate'], audio_duration,
+            original_duration, max_speedup, max_slowdown
+        )
 
-        # Clean up
-        for frame_file in frame_files:
-            os.remove(os.path.join(temp_dir, frame_file))
+        # Get sync_audio_path separately
+        sync_audio_path = os.path.join(self.sync_audio_dir, f"sync_audio_{self.generate_timestamp()}.wav")
+        torchaudio.save(sync_audio_path, sync_audio['waveform'].squeeze(0), sync_audio['sample_rate'])
+        sync_audio_duration = sync_audio['waveform'].shape[-1] / sync_audio['sample_rate']
 
-        return frames_tensor
+        return (
+            sync_images,
+            sync_audio,
+            sync_audio_path,
+            sync_video_path,
+            original_duration,
+            sync_video_duration,
+            audio_duration,
+            sync_audio_duration,
+            sync_frame_count
+        )
 
     def sync_audio_video(self, max_speedup=1.5, max_slowdown=0.5,
                          AUDIO=None, audio_path="", audio_duration=None,
-                         video_path="", IMAGES=None, output_fps=30.0):
+                         video_path="", IMAGES=None, output_fps=30.0, save_sync_video=True):
         """Main function to synchronize audio and video."""
         self.validate_speed_limits(max_speedup, max_slowdown)
 
@@ -365,13 +370,13 @@ class AudioVideoSync:
             
         # logging.info(f"Audio duration: {audio_duration}")
 
-        # Process input source
+        # Fast path for IMAGES: retime by index gather, encode at most once
         if IMAGES is not None and len(IMAGES) > 0:
-            video_path = self.process_images_to_video(IMAGES, output_fps)
-            original_duration = len(IMAGES) / output_fps
-            video_fps = output_fps
-            original_frame_count = len(IMAGES)
-        elif video_path:
+            return self.sync_images(IMAGES, AUDIO, audio_duration, output_fps,
+                                    max_speedup, max_slowdown, save_sync_video)
+
+        # Process input source
+        if video_path:
             original_duration, video_fps, original_frame_count = self.get_video_info(video_path)
         else:
             raise ValueError("Either video_path or IMAGES must be provided")
@@ -395,11 +400,10 @@ class AudioVideoSync:
         sync_video_duration, _, sync_frame_count = self.get_video_info(sync_video_path)
         sync_audio_duration = sync_audio['waveform'].shape[-1] / sync_audio['sample_rate']
 
-        video_frames = self.extract_frames(sync_video_path)
+        video_frames = self.extract_frames(sync_video_path, sync_frame_count)
         
         # Convert video_frames to the format expected by ComfyUI
         video_frames = video_frames.float() / 255.0
-        video_frames = video_frames.permute(0, 2, 3, 1)
         
         return (
             video_frames,
@@ -1,6 +1,6 @@
-import torch
+import re
 import numpy as np
-from PIL import Image
+import torch
 
 class CombineBackgroundOverlay:
     @classmethod
@@ -13,64 +13,93 @@ class CombineBackgroundOverlay:
                 "horizontal_position": ("FLOAT", {"default": 50, "min": -50, "max": 150, "step": 0.1}),
                 "vertical_position": ("FLOAT", {"default": 50, "min": -50, "max": 150, "step": 0.1}),
             },
+            "optional": {
+                # Per-frame positions, override the sliders above when not empty:
+                # keyframes "frame:position" interpolated over the batch (e.g. "0:10,50:80"),
+                # or one position per frame (e.g. "10,12,14"), the last one is held.
+                "horizontal_keyframes": ("STRING", {"default": ""}),
+                "vertical_keyframes": ("STRING", {"default": ""}),
+            },
         }
 
     RETURN_TYPES = ("IMAGE",)
     FUNCTION = "combine_background_overlay"
     CATEGORY = "Bjornulf"
 
-    def combine_background_overlay(self, background, overlay, mask, horizontal_position, vertical_position):
-        # Convert background from torch tensor to numpy array
-        bg = background[0].numpy()
-        bg = (bg * 255).astype(np.uint8)
-        bg_img = Image.fromarray(bg, 'RGB')
-
-        results = []
-
-        for ov, m in zip(overlay, mask):
-            # Convert overlay from torch tensor to numpy array
-            ov = ov.numpy()
-            ov = (ov * 255).astype(np.uint8)
-
-            # Convert mask from torch tensor to numpy array
-            m = m.numpy()
-            m = (m * 255).astype(np.uint8)
-
-            # Create PIL Image for overlay
-            ov_img = Image.fromarray(ov, 'RGB')
-            
-            # Create alpha channel from mask
-            alpha = Image.fromarray(m, 'L')
-            
-            # Combine RGB overlay with alpha mask
-            ov_img.putalpha(alpha)
-
-            # Calculate horizontal position
-            x = int((horizontal_position / 100) * (bg_img.width - ov_img.width))
-
-            # Calculate vertical position
-            y = int((vertical_position / 100) * (bg_img.height - ov_img.height))
-
-            # Create a new image for this overlay
-            result = Image.new('RGBA', bg_img.size, (0, 0, 0, 0))
-
-            # Paste the background
-            result.paste(bg_img, (0, 0))
-
-            # Paste the overlay in the calculated position
-            result.paste(ov_img, (x, y), ov_img)
-
-            # Convert back to numpy array and then to torch tensor
-            result_np = np.array(result)
-            
-            # Convert RGBA to RGB
-            result_np = result_np[:,:,:3]
-
-            result_tensor = torch.from_numpy(result_np).float() / 255.0
-
-            results.append(result_tensor)
-
-        # Stack all results into a single tensor
-        final_result = torch.stack(results)
-
-        return (final_result,)
\ No newline at end of file
+    def parse_positions(self, keyframes, default, batch_size):
+        """Position (in %) for each frame of the batch, from a keyframes string or the slider value."""
+        items = [item for item in re.split(r"[,;\s]+", keyframes or "") if item]
+        if not items:
+            return np.full(batch_size, float(default))
+
+        try:
+            if any(":" in item for item in items):
+                keys = sorted((float(frame), float(position)) for frame, position in (item.split(":", 1) for item in items))
+            else:
+                keys = [(float(frame), float(position)) for frame, position in enumerate(items)]
+        except ValueError:
+            raise ValueError(f"Invalid keyframes '{keyframes}', expected 'frame:position,...' or 'position,...'")
+
+        # Linear interpolation between keyframes, first/last value held before/after them
+        frames, positions = zip(*keys)
+        return np.interp(np.arange(batch_size), frames, positions)
+
+    def paste(self, result, overlay, mask, x, y):
+        """
+        Alpha blend overlay (B, h, w, 3) with mask (B, h, w) into result (B, H, W, 3) at (x, y), in place.
+        Parts of the overlay outside of the background are cropped, like PIL paste.
+        """
+        bg_height, bg_width = result.shape[1:3]
+        ov_height, ov_width = overlay.shape[1:3]
+
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + ov_width, bg_width), min(y + ov_height, bg_height)
+        if x0 >= x1 or y0 >= y1:
+            return result
+
+        ov = overlay[:, y0 - y:y1 - y, x0 - x:x1 - x]
+        m = mask[:, y0 - y:y1 - y, x0 - x:x1 - x].unsqueeze(-1)
+
+        # bg * (1 - m) + ov * m, written straight into the background region
+        region = result[:, y0:y1, x0:x1]
+        region.sub_(region * m).add_(ov * m)
+        return result
+
+    def combine_background_overlay(self, background, overlay, mask, horizontal_position, vertical_position, horizontal_keyframes="", vertical_keyframes=""):
+        if mask.dim() == 2:
+            mask = mask.unsqueeze(0)
+
+        # One output frame per overlay frame, a single mask is used for every frame
+        batch_size = overlay.shape[0] if mask.shape[0] == 1 else min(overlay.shape[0], mask.shape[0])
+        overlay = overlay[:batch_size, ..., :3].to(background.device, torch.float32)
+        mask = mask[:batch_size].to(background.device, torch.float32).expand(batch_size, -1, -1)
+
+        # Background batch with the same length as the overlay: one background per frame,
+        # otherwise the first background is used for every frame
+        if background.shape[0] == batch_size:
+            result = background[..., :3].float().clone()
+        else:
+            result = background[:1, ..., :3].float().repeat(batch_size, 1, 1, 1)
+
+        bg_height, bg_width = result.shape[1:3]
+        ov_height, ov_width = overlay.shape[1:3]
+
+        horizontal = self.parse_positions(horizontal_keyframes, horizontal_position, batch_size)
+        vertical = self.parse_positions(vertical_keyframes, vertical_position, batch_size)
+
+        # Calculate horizontal position
+        xs = ((horizontal / 100) * (bg_width - ov_width)).astype(int)
+
+        # Calculate vertical position
+        ys = ((vertical / 100) * (bg_height - ov_height)).astype(int)
+
+        if (xs == xs[0]).all() and (ys == ys[0]).all():
+            # Same position for every frame: a single blend over the whole batch
+            final_result = self.paste(result, overlay, mask, int(xs[0]), int(ys[0]))
+        else:
+            # Moving overlay: blend each frame through a view, still in place
+            for i, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+                self.paste(result[i:i + 1], overlay[i:i + 1], mask[i:i + 1], x, y)
+            final_result = result
+
+        return (final_result,)
@@ -1,5 +1,5 @@
 import torch
-import numpy as np
+from .image_merge import merge_images, stack_images
 
 class CombineImages:
     SPECIAL_PREFIX = "ImSpEcIaL"  # The special text prefix to look for
@@ -12,6 +12,11 @@ class CombineImages:
                 "all_in_one": ("BOOLEAN", {"default": False}),
                 "image_1": ("IMAGE",),
             },
+            "optional": {
+                # all_in_one layout: one batch ("batch") or a single merged canvas per frame
+                "merge_layout": (["batch", "horizontal", "vertical", "grid"], {"default": "batch"}),
+                "grid_columns": ("INT", {"default": 0, "min": 0, "max": 50, "step": 1}),
+            },
             "hidden": {
                 **{f"image_{i}": ("IMAGE",) for i in range(2, 51)}
             }
@@ -22,7 +27,7 @@ class CombineImages:
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def all_in_one_images(self, number_of_images, all_in_one, **kwargs):
+    def all_in_one_images(self, number_of_images, all_in_one, merge_layout="batch", grid_columns=0, **kwargs):
         # Retrieve all inputs based on number_of_images
         inputs = [kwargs.get(f"image_{i}", None) for i in range(1, number_of_images + 1)]
 
@@ -51,45 +56,19 @@ class CombineImages:
             raise ValueError("No valid image inputs provided after filtering non-image inputs.")
 
         if all_in_one:
+            if merge_layout != "batch":
+                # Differing resolutions and batch sizes are fine when merging on one canvas
+                return (merge_images(images, merge_layout, grid_columns),)
+
             # Check if all images have the same shape
-            shapes = [img.shape for img in images]
+            shapes = [tuple(img.shape[-3:]) for img in images]
             if len(set(shapes)) > 1:
                 raise ValueError("All images must have the same resolution to use all_in_one. "
                                  f"Found different shapes: {shapes}")
 
-            # Convert images to float32 and scale to 0-1 range if necessary
-            processed_images = []
-            for img in images:
-                if isinstance(img, np.ndarray):
-                    if img.dtype == np.uint8:
-                        img = img.astype(np.float32) / 255.0
-                    elif img.dtype == np.bool_:
-                        img = img.astype(np.float32)
-                elif isinstance(img, torch.Tensor):
-                    if img.dtype == torch.uint8:
-                        img = img.float() / 255.0
-                    elif img.dtype == torch.bool:
-                        img = img.float()
-
-                # Ensure the image is 3D (height, width, channels)
-                if img.ndim == 4:
-                    img = img.squeeze(0)
-
-                processed_images.append(img)
-
-            # Stack all images along a new dimension
-            if isinstance(processed_images[0], np.ndarray):
-                all_in_oned = np.stack(processed_images)
-                all_in_oned = torch.from_numpy(all_in_oned)
-            else:
-                all_in_oned = torch.stack(processed_images)
-
-            # Ensure the output is in the format expected by the preview node
-            # (batch, height, width, channels)
-            if all_in_oned.ndim == 3:
-                all_in_oned = all_in_oned.unsqueeze(0)
-            if all_in_oned.shape[-1] != 3 and all_in_oned.shape[-1] != 4:
-                all_in_oned = all_in_oned.permute(0, 2, 3, 1)
+            # One preallocated batch, each image copied in with a single slice assignment
+            # (uint8/bool inputs are converted to float 0-1)
+            all_in_oned = stack_images(images)
 
             return (all_in_oned,)
         else:
@@ -1,8 +1,6 @@
 import os
-import numpy as np
-import torch
 import subprocess
-from PIL import Image
+from .frame_writer import write_frames, FRAME_FORMATS
 
 class imgs2vid:
     @classmethod
@@ -15,6 +13,11 @@ class imgs2vid:
                 "format": (["mp4", "webm"],),
                 "audio_path": ("STRING", {"default": "/home/umen/6sec.wav"}),  # New audio input
             },
+            "optional": {
+                "frame_format": (FRAME_FORMATS, {"default": "png"}),
+                "png_compress_level": ("INT", {"default": 1, "min": 0, "max": 9}),
+                "frame_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
+            },
         }
 
     RETURN_TYPES = ("STRING",)
@@ -23,7 +26,8 @@ class imgs2vid:
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def create_video(self, images, fps, video_name_NO_format, format, audio_path):
+    def create_video(self, images, fps, video_name_NO_format, format, audio_path,
+                     frame_format="png", png_compress_level=1, frame_workers=0):
         # Remove any existing extension
         video_name_NO_format = os.path.splitext(video_name_NO_format)[0]
         # Add the correct extension
@@ -33,12 +37,11 @@ class imgs2vid:
         # Ensure the output directory exists
         os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
 
-        # Save the tensor images as PNG files
-        for i, img_tensor in enumerate(images):
-            img = Image.fromarray((img_tensor.cpu().numpy() * 255).astype(np.uint8))
-            if format == "webm":
-                img = img.convert("RGBA")  # Ensure alpha channel for WebM
-            img.save(os.path.join(temp_dir, f"frame_{i:04d}.png"))
+        # Save the tensor images (RGBA for WebM to keep the alpha channel)
+        frames_pattern = write_frames(
+            images, temp_dir, name="frame_%04d", frame_format=frame_format,
+            compress_level=png_compress_level, max_workers=frame_workers, rgba=(format == "webm")
+        )
 
         # Construct the FFmpeg command based on the selected format
         if format == "mp4":
@@ -46,7 +49,7 @@ class imgs2vid:
                 "ffmpeg",
                 "-y",
                 "-framerate", str(fps),
-                "-i", os.path.join(temp_dir, "frame_%04d.png"),
+                "-i", frames_pattern,
                 "-i", str(audio_path),
                 "-crf", "19",
                 "-c:v", "libx264",
@@ -59,7 +62,7 @@ class imgs2vid:
                 "ffmpeg",
                 "-y",
                 "-framerate", str(fps),
-                "-i", os.path.join(temp_dir, "frame_%04d.png"),
+                "-i", frames_pattern,
                 "-i", str(audio_path),
                 "-crf", "19",
                 "-c:v", "libvpx",
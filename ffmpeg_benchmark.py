@@ -0,0 +1,287 @@
+import os
+import re
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+# Encoder benchmark: encode the same frames under a matrix of codec/preset/crf/pix_fmt
+# settings and measure speed, size and quality (PSNR/SSIM from ffmpeg's own filters).
+# Works as a node (FFmpegBenchmark) and as a CLI: python ffmpeg_benchmark.py --help
+# Only needs ffmpeg + numpy, so it runs on CPU-only machines.
+
+# Extra arguments some encoders need for a meaningful crf run, and whether they accept -preset
+CODEC_OPTIONS = {
+    "libx264": {"preset": True, "args": []},
+    "libx265": {"preset": True, "args": ["-x265-params", "log-level=error"]},
+    "libvpx-vp9": {"preset": False, "args": ["-b:v", "0", "-row-mt", "1"]},
+    "libaom-av1": {"preset": False, "args": ["-b:v", "0", "-cpu-used", "8", "-row-mt", "1"]},
+    "libsvtav1": {"preset": False, "args": []},
+    "h264_nvenc": {"preset": True, "args": []},
+    "hevc_nvenc": {"preset": True, "args": []},
+    "av1_nvenc": {"preset": True, "args": []},
+}
+
+
+def make_synthetic_frames(frames=48, width=640, height=360, seed=0):
+    """Moving gradients, a scrolling pattern and some noise: cheap to generate, not trivial to encode."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    noise = rng.random((height, width), dtype=np.float32) * 0.08
+    out = np.empty((frames, height, width, 3), dtype=np.uint8)
+    for i in range(frames):
+        t = i / max(frames, 1)
+        r = 0.5 + 0.5 * np.sin((x / width + t) * 2 * np.pi)
+        g = 0.5 + 0.5 * np.cos((y / height - t) * 2 * np.pi)
+        b = ((x + y + i * 8) % 64 < 32).astype(np.float32) * 0.7 + noise
+        out[i] = (np.clip(np.stack([r, g, b], axis=-1), 0, 1) * 255).astype(np.uint8)
+    return out
+
+
+def images_to_frames(images):
+    """IMAGE tensor [B, H, W, C] float -> uint8 numpy rgb24 frames."""
+    frames = (images[..., :3].clamp(0, 1) * 255).byte().cpu().numpy()
+    # yuv420 needs even dimensions
+    height, width = frames.shape[1] - frames.shape[1] % 2, frames.shape[2] - frames.shape[2] % 2
+    return np.ascontiguousarray(frames[:, :height, :width])
+
+
+def parse_list(value):
+    return [item.strip() for item in str(value).replace("\n", ",").split(",") if item.strip()]
+
+
+def raw_input_args(width, height, fps):
+    return ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-framerate", str(fps)]
+
+
+def build_encode_command(ffmpeg_path, reference, width, height, fps, codec, preset, crf, pix_fmt, output):
+    options = CODEC_OPTIONS.get(codec, {"preset": True, "args": []})
+    cmd = [ffmpeg_path, "-y", "-v", "error", *raw_input_args(width, height, fps), "-i", reference, "-c:v", codec]
+    if preset and preset != "None" and options["preset"]:
+        cmd.extend(["-preset", preset])
+    if "nvenc" in codec:
+        cmd.extend(["-cq", str(crf)])
+    else:
+        cmd.extend(["-crf", str(crf)])
+    cmd.extend(options["args"])
+    if pix_fmt and pix_fmt != "None":
+        cmd.extend(["-pix_fmt", pix_fmt])
+    cmd.extend(["-an", output])
+    return cmd
+
+
+def measure_quality(ffmpeg_path, encoded, reference, width, height, fps):
+    """PSNR and SSIM of the encoded file against the raw reference, in a single ffmpeg pass."""
+    cmd = [
+        ffmpeg_path, "-v", "info", "-nostats",
+        "-i", encoded,
+        *raw_input_args(width, height, fps), "-i", reference,
+        # Renumber timestamps on both sides (pts = frame index): container timestamps are
+        # rounded (mkv uses 1/1000) and would make the filters pair frame N with frame N-1
+        "-lavfi", "[0:v]settb=1,setpts=N,format=yuv444p[d];"
+                  "[1:v]settb=1,setpts=N,format=yuv444p,split[r1][r2];"
+                  "[d][r1]ssim[s];[s][r2]psnr",
+        "-f", "null", "-"
+    ]
+    stderr = subprocess.run(cmd, capture_output=True, text=True).stderr
+    psnr = re.search(r"PSNR .*average:([\d.]+|inf)", stderr)
+    ssim = re.search(r"SSIM .*All:([\d.]+)", stderr)
+    return (
+        float(psnr.group(1)) if psnr else None,
+        float(ssim.group(1)) if ssim else None,
+    )
+
+
+def run_benchmark(frames, fps=24.0, codecs=("libx264",), presets=("medium",), crfs=(23,),
+                  pix_fmts=("yuv420p",), ffmpeg_path="ffmpeg", container="mkv"):
+    """
+    Encode frames (uint8 numpy [B, H, W, 3]) under every combination of settings.
+
+    Returns one dict per run: codec, preset, crf, pix_fmt, wall_time, fps, size_bytes, psnr, ssim, error.
+    """
+    count, height, width = frames.shape[0], frames.shape[1], frames.shape[2]
+    work_dir = tempfile.mkdtemp(prefix="bjornulf_ffmpeg_benchmark_")
+    results = []
+    try:
+        # Raw reference written once: every run reads the same bytes, no PNG decode in the timing
+        reference = os.path.join(work_dir, "reference.rgb")
+        frames.tofile(reference)
+
+        for codec in codecs:
+            options = CODEC_OPTIONS.get(codec, {"preset": True})
+            codec_presets = presets if options["preset"] else ["None"]
+            for preset in codec_presets:
+                for crf in crfs:
+                    for pix_fmt in pix_fmts:
+                        output = os.path.join(work_dir, f"run_{len(results):03d}.{container}")
+                        cmd = build_encode_command(ffmpeg_path, reference, width, height, fps,
+                                                   codec, preset, crf, pix_fmt, output)
+                        result = {"codec": codec, "preset": preset, "crf": int(crf), "pix_fmt": pix_fmt,
+                                  "wall_time": None, "fps": None, "size_bytes": None,
+                                  "psnr": None, "ssim": None, "error": None}
+                        start = time.perf_counter()
+                        process = subprocess.run(cmd, capture_output=True, text=True)
+                        wall_time = time.perf_counter() - start
+                        if process.returncode != 0 or not os.path.exists(output):
+                            result["error"] = (process.stderr.strip().splitlines() or ["ffmpeg failed"])[-1]
+                        else:
+                            result["wall_time"] = wall_time
+                            result["fps"] = count / wall_time if wall_time > 0 else None
+                            result["size_bytes"] = os.path.getsize(output)
+                            result["psnr"], result["ssim"] = measure_quality(ffmpeg_path, output, reference, width, height, fps)
+                            os.remove(output)
+                        results.append(result)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def pick_best(results, min_psnr=0.0, min_ssim=0.0):
+    """Fastest successful run meeting the quality bar, or None."""
+    candidates = [
+        r for r in results
+        if r["error"] is None
+        and (r["psnr"] is not None and r["psnr"] >= min_psnr)
+        and (r["ssim"] is not None and r["ssim"] >= min_ssim)
+    ]
+    return min(candidates, key=lambda r: r["wall_time"]) if candidates else None
+
+
+def format_report(results, frame_count, width, height, best=None):
+    lines = [f"⏱📹 FFmpeg encoder benchmark : {frame_count} frames @ {width}x{height}", ""]
+    lines.append(f"{'codec':<12} {'preset':<10} {'crf':>4} {'pix_fmt':<12} {'time(s)':>8} {'fps':>8} {'size(KB)':>9} {'PSNR':>7} {'SSIM':>7}")
+    for r in results:
+        if r["error"]:
+            lines.append(f"{r['codec']:<12} {r['preset']:<10} {r['crf']:>4} {r['pix_fmt']:<12} ❌ {r['error']}")
+            continue
+        psnr = f"{r['psnr']:.2f}" if r["psnr"] is not None else "N/A"
+        ssim = f"{r['ssim']:.4f}" if r["ssim"] is not None else "N/A"
+        lines.append(
+            f"{r['codec']:<12} {r['preset']:<10} {r['crf']:>4} {r['pix_fmt']:<12} "
+            f"{r['wall_time']:>8.2f} {r['fps']:>8.1f} {r['size_bytes'] / 1024:>9.1f} {psnr:>7} {ssim:>7}"
+        )
+    lines.append("")
+    if best:
+        lines.append(f"🏆 Fastest config meeting the quality bar : {best['codec']} preset={best['preset']} "
+                     f"crf={best['crf']} pix_fmt={best['pix_fmt']} ({best['fps']:.1f} fps)")
+    else:
+        lines.append("❌ No config met the quality bar")
+    return "\n".join(lines)
+
+
+def best_to_ffmpeg_config(best, ffmpeg_path="ffmpeg", container="mkv"):
+    """FFMPEG_CONFIG_JSON (same layout as FFmpegConfig) for the winning run."""
+    if not best:
+        return ""
+    return json.dumps({
+        "ffmpeg": {"path": ffmpeg_path},
+        "video": {
+            "codec": best["codec"],
+            "bitrate_mode": "crf",
+            "bitrate": None,
+            "preset": best["preset"],
+            "pixel_format": best["pix_fmt"],
+            "crf": best["crf"],
+            "resolution": None,
+            "fps": {"force_fps": 0.0, "enabled": False},
+            "force_transparency_webm": False
+        },
+        "audio": {"codec": "None", "bitrate": None},
+        "output": {"container_format": container}
+    }, indent=2)
+
+
+class FFmpegBenchmark:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "ffmpeg_path": ("STRING", {"default": "ffmpeg"}),
+                "codecs": ("STRING", {"default": "libx264, libx265, libvpx-vp9"}),
+                "presets": ("STRING", {"default": "ultrafast, veryfast, medium"}),
+                "crfs": ("STRING", {"default": "18, 23"}),
+                "pixel_formats": ("STRING", {"default": "yuv420p"}),
+                "fps": ("FLOAT", {"default": 24.0, "min": 1.0, "max": 240.0}),
+                "min_psnr": ("FLOAT", {"default": 35.0, "min": 0.0, "max": 100.0, "step": 0.1}),
+                "min_ssim": ("FLOAT", {"default": 0.95, "min": 0.0, "max": 1.0, "step": 0.001}),
+                "synthetic_frames": ("INT", {"default": 48, "min": 1, "max": 10000}),
+                "synthetic_width": ("INT", {"default": 640, "min": 16, "max": 8192}),
+                "synthetic_height": ("INT", {"default": 360, "min": 16, "max": 8192}),
+            },
+            "optional": {
+                "images": ("IMAGE",),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING", "STRING",)
+    RETURN_NAMES = ("report", "results_json", "FFMPEG_CONFIG_JSON",)
+    FUNCTION = "benchmark"
+    OUTPUT_NODE = True
+    CATEGORY = "Bjornulf"
+
+    def benchmark(self, ffmpeg_path, codecs, presets, crfs, pixel_formats, fps, min_psnr, min_ssim,
+                  synthetic_frames=48, synthetic_width=640, synthetic_height=360, images=None):
+        if images is not None:
+            frames = images_to_frames(images)
+        else:
+            frames = make_synthetic_frames(synthetic_frames, synthetic_width - synthetic_width % 2,
+                                      synthetic_height - synthetic_height % 2)
+
+        results = run_benchmark(
+            frames, fps, parse_list(codecs), parse_list(presets),
+            [int(crf) for crf in parse_list(crfs)], parse_list(pixel_formats), ffmpeg_path
+        )
+        best = pick_best(results, min_psnr, min_ssim)
+        report = format_report(results, frames.shape[0], frames.shape[2], frames.shape[1], best)
+        return (report, json.dumps(results, indent=2), best_to_ffmpeg_config(best, ffmpeg_path))
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return float("NaN")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ffmpeg encoder settings (speed, size, PSNR/SSIM).")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable")
+    parser.add_argument("--input", help="Video file to use as source frames (default: synthetic frames)")
+    parser.add_argument("--frames", type=int, default=48, help="Number of frames (synthetic, or max taken from --input)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=float, default=24.0)
+    parser.add_argument("--codecs", default="libx264,libx265,libvpx-vp9")
+    parser.add_argument("--presets", default="ultrafast,veryfast,medium")
+    parser.add_argument("--crfs", default="18,23")
+    parser.add_argument("--pix-fmts", default="yuv420p")
+    parser.add_argument("--min-psnr", type=float, default=35.0)
+    parser.add_argument("--min-ssim", type=float, default=0.95)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    width, height = args.width - args.width % 2, args.height - args.height % 2
+    if args.input:
+        # Decode (and scale) the input once to the raw reference frames
+        raw = subprocess.run([
+            args.ffmpeg, "-v", "error", "-i", args.input,
+            "-frames:v", str(args.frames), "-vf", f"scale={width}:{height}",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-"
+        ], capture_output=True, check=True).stdout
+        frames = np.frombuffer(raw, dtype=np.uint8).reshape(-1, height, width, 3)
+    else:
+        frames = make_synthetic_frames(args.frames, width, height)
+
+    results = run_benchmark(
+        frames, args.fps, parse_list(args.codecs), parse_list(args.presets),
+        [int(crf) for crf in parse_list(args.crfs)], parse_list(args.pix_fmts), args.ffmpeg
+    )
+    best = pick_best(results, args.min_psnr, args.min_ssim)
+    if args.json:
+        print(json.dumps({"results": results, "best": best}, indent=2))
+    else:
+        print(format_report(results, frames.shape[0], width, height, best))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 import os
 import subprocess
 import tempfile
-from PIL import Image
 import numpy as np
 import torch
 import torchaudio
 import time
 import shutil
+from .ffmpeg_probe import probe
+from .frame_writer import write_frames, FRAME_FORMATS
 
 class CombineVideoAudio:
     def __init__(self):
@@ -26,6 +27,9 @@ class CombineVideoAudio:
                 "audio_path": ("STRING", {"default": "", "multiline": False, "forceInput": True}),
                 "video_path": ("STRING", {"default": "", "multiline": False, "forceInput": True}),
                 "fps": ("FLOAT", {"default": 30.0, "min": 1.0, "max": 120.0, "step": 0.1}),
+                "frame_format": (FRAME_FORMATS, {"default": "png"}),
+                "png_compress_level": ("INT", {"default": 1, "min": 0, "max": 9}),
+                "frame_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             }
         }
 
@@ -35,53 +39,32 @@ class CombineVideoAudio:
     CATEGORY = "Bjornulf"
     
     def get_video_frame_count(self, video_path):
-        try:
-            result = subprocess.run([
-                "ffprobe", "-v", "error", "-count_packets",
-                "-select_streams", "v:0", "-show_entries", "stream=nb_read_packets",
-                "-of", "csv=p=0", video_path
-            ], capture_output=True, text=True, check=True)
-            
-            frame_count = result.stdout.strip()
-            if not frame_count:
-                raise ValueError("ffprobe returned empty frame count")
-            
-            return int(frame_count)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running ffprobe: {e}")
-            print(f"ffprobe stderr: {e.stderr}")
-            raise
-        except ValueError as e:
-            print(f"Error parsing ffprobe output: {e}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error getting frame count: {e}")
-            raise
+        frame_count = probe(video_path).frame_count
+        if not frame_count:
+            raise ValueError("ffprobe returned empty frame count")
+        return frame_count
     
     def get_video_duration(self, video_path):
-        try:
-            result = subprocess.run([
-                "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1", video_path
-            ], capture_output=True, text=True, check=True)
-            
-            duration = result.stdout.strip()
-            if not duration:
-                raise ValueError("ffprobe returned empty duration")
-            
-            return float(duration)
-        except subprocess.CalledProcessError as e:
-            print(f"Error running ffprobe: {e}")
-            print(f"ffprobe stderr: {e.stderr}")
-            raise
-        except ValueError as e:
-            print(f"Error parsing ffprobe output: {e}")
-            raise
-        except Exception as e:
-            print(f"Unexpected error getting video duration: {e}")
-            raise
+        duration = probe(video_path).duration
+        if not duration:
+            raise ValueError("ffprobe returned empty duration")
+        return duration
     
-    def combine_audio_video(self, IMAGES=None, AUDIO=None, audio_path="", video_path="", fps=30.0):
+    def convert_frame(self, frame):
+        if isinstance(frame, torch.Tensor):
+            frame = frame.cpu().numpy()
+        
+        if frame.ndim == 4:
+            frame = frame.squeeze(0)  # Remove batch dimension if present
+        if frame.shape[0] == 3:
+            frame = frame.transpose(1, 2, 0)  # CHW to HWC
+        
+        if frame.dtype != np.uint8:
+            frame = (frame * 255).astype(np.uint8)
+        return frame
+
+    def combine_audio_video(self, IMAGES=None, AUDIO=None, audio_path="", video_path="", fps=30.0,
+                            frame_format="png", png_compress_level=1, frame_workers=0):
         temp_dir = tempfile.mkdtemp(dir=self.temp_dir)
         try:
             # Handle audio input
@@ -112,20 +95,11 @@ class CombineVideoAudio:
             if video_path and os.path.exists(video_path):
                 final_video_path = video_path
             elif IMAGES is not None:
-                frames_path = os.path.join(temp_dir, "frame_%04d.png")
-                for i, frame in enumerate(IMAGES):
-                    if isinstance(frame, torch.Tensor):
-                        frame = frame.cpu().numpy()
-                    
-                    if frame.ndim == 4:
-                        frame = frame.squeeze(0)  # Remove batch dimension if present
-                    if frame.shape[0] == 3:
-                        frame = frame.transpose(1, 2, 0)  # CHW to HWC
-                    
-                    if frame.dtype != np.uint8:
-                        frame = (frame * 255).astype(np.uint8)
-                    
-                    Image.fromarray(frame).save(frames_path % (i + 1))
+                frames_path = write_frames(
+                    IMAGES, temp_dir, name="frame_%04d", frame_format=frame_format,
+                    compress_level=png_compress_level, max_workers=frame_workers,
+                    start_number=1, to_array=self.convert_frame
+                )
                 
                 final_video_path = os.path.join(temp_dir, "temp_video.mp4")
                 subprocess.run([
@@ -2,6 +2,7 @@ import subprocess
 from pathlib import Path
 import os
 import json
+from .ffmpeg_parallel_concat import parallel_concat, CONCAT_MODES
 
 class ConcatVideos:
     @classmethod
@@ -14,6 +15,8 @@ class ConcatVideos:
             },
             "optional": {
                 "FFMPEG_CONFIG_JSON": ("STRING", {"forceInput": True}),
+                "concat_mode": (CONCAT_MODES, {"default": "single_ffmpeg"}),
+                "max_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             },
             "hidden": {
                 **{f"video_path_{i}": ("STRING", {"forceInput": True}) for i in range(1, 51)}
@@ -34,10 +37,13 @@ class ConcatVideos:
 
     def concat_videos(self, number_of_videos: int, output_filename: str, 
                      use_python_ffmpeg: bool = False, 
-                     FFMPEG_CONFIG_JSON: str = None, **kwargs):
+                     FFMPEG_CONFIG_JSON: str = None,
+                     concat_mode: str = "single_ffmpeg", max_workers: int = 0, **kwargs):
         """
         Concatenate multiple videos using ffmpeg.
         Supports both subprocess and python-ffmpeg methods.
+        With concat_mode "parallel_stream_copy", clips are probed and stream copied when they match,
+        mismatching clips (or all of them with a FFMPEG_CONFIG_JSON encoder) are encoded in parallel first.
         """
         # Get and validate video paths
         video_paths = [kwargs[f"video_path_{i}"] for i in range(1, number_of_videos + 1) 
@@ -116,6 +122,11 @@ class ConcatVideos:
                 
                 return str(output_path), ' '.join(ffmpeg_cmd)
 
+            # Probe, normalize in parallel if needed, then stream copy
+            elif concat_mode == "parallel_stream_copy":
+                cmds = parallel_concat(video_paths, output_path, self.work_dir, config, max_workers)
+                return str(output_path), '\n'.join(' '.join(cmd) for cmd in cmds)
+
             # Default to subprocess method
             else:
                 # Default simple concatenation command
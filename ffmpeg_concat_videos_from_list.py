@@ -2,6 +2,7 @@ import subprocess
 from pathlib import Path
 import os
 import json
+from .ffmpeg_parallel_concat import parallel_concat, CONCAT_MODES
 
 class ConcatVideosFromList:
     @classmethod
@@ -14,6 +15,8 @@ class ConcatVideosFromList:
             },
             "optional": {
                 "FFMPEG_CONFIG_JSON": ("STRING", {"forceInput": True}),
+                "concat_mode": (CONCAT_MODES, {"default": "single_ffmpeg"}),
+                "max_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             }
         }
 
@@ -31,10 +34,13 @@ class ConcatVideosFromList:
 
     def concat_videos(self, files: str, output_filename: str, 
                     use_python_ffmpeg: bool = False, 
-                    FFMPEG_CONFIG_JSON: str = None):
+                    FFMPEG_CONFIG_JSON: str = None,
+                    concat_mode: str = "single_ffmpeg", max_workers: int = 0):
         """
         Concatenate multiple videos using ffmpeg.
         Supports both subprocess and python-ffmpeg methods.
+        With concat_mode "parallel_stream_copy", clips are probed and stream copied when they match,
+        mismatching clips (or all of them with a FFMPEG_CONFIG_JSON encoder) are encoded in parallel first.
         """
         # Split the multiline string into a list of video paths
         video_paths = [path.strip() for path in files.split('\n') if path.strip()]
@@ -111,6 +117,11 @@ class ConcatVideosFromList:
                 
                 return str(output_path), ' '.join(ffmpeg_cmd)
 
+            # Probe, normalize in parallel if needed, then stream copy
+            elif concat_mode == "parallel_stream_copy":
+                cmds = parallel_concat(video_paths, output_path, self.work_dir, config, max_workers)
+                return str(output_path), '\n'.join(' '.join(cmd) for cmd in cmds)
+
             # Default to subprocess method
             else:
                 # Default simple concatenation command
@@ -1,12 +1,11 @@
 import os
-import numpy as np
 import torch
 import subprocess
 import json
-from PIL import Image
 import soundfile as sf
 import glob
 import logging
+from .frame_writer import write_frames
 
 class imagesToVideo:
     @classmethod
@@ -22,6 +21,7 @@ class imagesToVideo:
                 "audio": ("AUDIO",),
                 "audio_path": ("STRING", {"forceInput": True}),
                 "FFMPEG_CONFIG_JSON": ("STRING", {"forceInput": True}),
+                "pipe_frames": ("BOOLEAN", {"default": True}),
             },
         }
 
@@ -40,6 +40,45 @@ class imagesToVideo:
             print("Error parsing FFmpeg config JSON")
             return None
 
+    def get_pipe_pix_fmt(self, images, format):
+        """Raw pixel format sent to ffmpeg stdin: rgba when there is (or must be) an alpha channel."""
+        if images.shape[-1] == 4 or format == "webm":
+            return "rgba"
+        return "rgb24"
+
+    def write_frames_to_pipe(self, process, images, pix_fmt, chunk_size=16):
+        """
+        Write the IMAGE tensor to ffmpeg stdin as uint8 rawvideo, chunk_size frames at a time.
+
+        Only one chunk is converted to uint8 at a time, so memory stays bounded for long batches.
+        """
+        for start in range(0, images.shape[0], chunk_size):
+            chunk = images[start:start + chunk_size]
+            chunk = (chunk.clamp(0, 1) * 255).to(torch.uint8)
+            if pix_fmt == "rgba" and chunk.shape[-1] == 3:
+                alpha = torch.full((*chunk.shape[:-1], 1), 255, dtype=torch.uint8, device=chunk.device)
+                chunk = torch.cat([chunk, alpha], dim=-1)
+            elif pix_fmt == "rgb24" and chunk.shape[-1] == 4:
+                chunk = chunk[..., :3]
+            process.stdin.write(chunk.cpu().contiguous().numpy().tobytes())
+
+    def run_ffmpeg_pipe(self, ffmpeg_cmd, images, pix_fmt):
+        """Run ffmpeg with rawvideo on stdin, raise CalledProcessError on failure like subprocess.run(check=True)."""
+        process = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE)
+        try:
+            self.write_frames_to_pipe(process, images, pix_fmt)
+        except BrokenPipeError:
+            # ffmpeg exited early, the return code below carries the error
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, ffmpeg_cmd)
+
     def run_ffmpeg_python(self, ffmpeg_cmd, output_file, ffmpeg_path):
         try:
             import ffmpeg
@@ -165,7 +204,7 @@ class imagesToVideo:
         
         return next_filename
 
-    def image_to_video(self, images, fps, name_prefix, use_python_ffmpeg=False, audio=None, audio_path=None, FFMPEG_CONFIG_JSON=None):
+    def image_to_video(self, images, fps, name_prefix, use_python_ffmpeg=False, audio=None, audio_path=None, FFMPEG_CONFIG_JSON=None, pipe_frames=True):
         ffmpeg_config = self.parse_ffmpeg_config(FFMPEG_CONFIG_JSON)
         
         format = "mp4"
@@ -190,11 +229,12 @@ class imagesToVideo:
         os.makedirs(temp_dir, exist_ok=True)
         os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
         
-        for i, img_tensor in enumerate(images):
-            img = Image.fromarray((img_tensor.cpu().numpy() * 255).astype(np.uint8))
-            if format == "webm":
-                img = img.convert("RGBA")
-            img.save(os.path.join(temp_dir, f"frame_{i:04d}.png"))
+        # ffmpeg-python parses the command for an image sequence input, so it always uses PNG frames
+        use_pipe = pipe_frames and not use_python_ffmpeg
+        pipe_pix_fmt = self.get_pipe_pix_fmt(images, format)
+
+        if not use_pipe:
+            write_frames(images, temp_dir, name="frame_%04d", rgba=(format == "webm"))
 
         # Handle audio from either AUDIO type or audio_path
         temp_audio_file = None
@@ -219,12 +259,24 @@ class imagesToVideo:
         if ffmpeg_config and ffmpeg_config["ffmpeg"]["path"]:
             ffmpeg_path = ffmpeg_config["ffmpeg"]["path"]
 
-        ffmpeg_cmd = [
-            ffmpeg_path,
-            "-y",
-            "-framerate", str(fps),
-            "-i", os.path.join(temp_dir, "frame_%04d.png"),
-        ]
+        if use_pipe:
+            height, width = images.shape[1], images.shape[2]
+            ffmpeg_cmd = [
+                ffmpeg_path,
+                "-y",
+                "-f", "rawvideo",
+                "-pix_fmt", pipe_pix_fmt,
+                "-s", f"{width}x{height}",
+                "-framerate", str(fps),
+                "-i", "-",
+            ]
+        else:
+            ffmpeg_cmd = [
+                ffmpeg_path,
+                "-y",
+                "-framerate", str(fps),
+                "-i", os.path.join(temp_dir, "frame_%04d.png"),
+            ]
 
         # logging.info(f"temp_audio_file : {temp_audio_file}")
         if temp_audio_file:
@@ -311,6 +363,9 @@ class imagesToVideo:
             if use_python_ffmpeg:
                 success, message = self.run_ffmpeg_python(ffmpeg_cmd, output_file, ffmpeg_path)
                 comment = f"Python FFmpeg: {message}" if not success else f"Video created successfully with {'custom' if ffmpeg_config else 'default'} settings (Python FFmpeg)"
+            elif use_pipe:
+                self.run_ffmpeg_pipe(ffmpeg_cmd, images, pipe_pix_fmt)
+                comment = f"Video created successfully with {'custom' if ffmpeg_config else 'default'} FFmpeg settings (rawvideo pipe)"
             else:
                 subprocess.run(ffmpeg_cmd, check=True)
                 comment = f"Video created successfully with {'custom' if ffmpeg_config else 'default'} FFmpeg settings"
@@ -712,12 +767,17 @@ class imagesToVideo:
                 comment_lines.append("  💡 For next improvement: Use WebM format for web-compatible transparency")
 
         # Temp frames information
-        comment_lines.append(f"• Temp Frames: {len(images)} images @ {temp_dir}")
-        comment_lines.append(f"  ℹ️ Processing {len(images)} individual frames")
-        if len(images) > 1000:
-            comment_lines.append("  ⚠️ Large frame count (>1000): May require significant processing time")
-            comment_lines.append(f"  💡 Estimated size: ~{len(images) * 0.2:.1f}MB temporary storage")
-        comment_lines.append(f"  🗂️ Temporary directory: {temp_dir}")
+        if use_pipe:
+            comment_lines.append(f"• Frames: {len(images)} images piped to ffmpeg stdin (rawvideo {pipe_pix_fmt})")
+            comment_lines.append("  ℹ️ No temporary PNG files written, no PNG encode/decode round trip")
+        else:
+            comment_lines.append(f"• Temp Frames: {len(images)} images @ {temp_dir}")
+            comment_lines.append(f"  ℹ️ Processing {len(images)} individual frames")
+            if len(images) > 1000:
+                comment_lines.append("  ⚠️ Large frame count (>1000): May require significant processing time")
+                comment_lines.append(f"  💡 Estimated size: ~{len(images) * 0.2:.1f}MB temporary storage")
+                comment_lines.append("  💡 For next improvement: Enable 'pipe_frames' to skip temporary PNG files")
+            comment_lines.append(f"  🗂️ Temporary directory: {temp_dir}")
 
         # Execution status
         try:
@@ -4,10 +4,10 @@ import subprocess
 import tempfile
 import torch
 import numpy as np
-from PIL import Image
 import wave
 import json
 import ffmpeg
+from .frame_writer import write_frames, FRAME_FORMATS
 
 class ImagesListToVideo:
     @classmethod
@@ -21,6 +21,9 @@ class ImagesListToVideo:
                 "audio_path": ("STRING", {"forceInput": True}),
                 "audio": ("AUDIO", {"default": None}),
                 "FFMPEG_CONFIG_JSON": ("STRING", {"forceInput": True}),
+                "frame_format": (FRAME_FORMATS, {"default": "png"}),
+                "png_compress_level": ("INT", {"default": 1, "min": 0, "max": 9}),
+                "frame_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             }
         }
     
@@ -92,7 +95,8 @@ class ImagesListToVideo:
         
         return cmd
 
-    def images_to_video(self, images, fps=30, audio_path="", audio=None, FFMPEG_CONFIG_JSON=None):
+    def images_to_video(self, images, fps=30, audio_path="", audio=None, FFMPEG_CONFIG_JSON=None,
+                        frame_format="png", png_compress_level=1, frame_workers=0):
         config = self.parse_ffmpeg_config(FFMPEG_CONFIG_JSON)
         
         output_dir = os.path.join("Bjornulf", "images_to_video")
@@ -108,15 +112,10 @@ class ImagesListToVideo:
 
         with tempfile.TemporaryDirectory() as temp_dir:
             # Save frames as images
-            for i, img in enumerate(images):
-                img_np = self.convert_to_numpy(img)
-                if img_np.shape[-1] != 3:
-                    img_np = self.convert_to_rgb(img_np)
-                img_pil = Image.fromarray(img_np)
-                img_path = os.path.join(temp_dir, f"frame_{i:05d}.png")
-                img_pil.save(img_path)
-
-            input_pattern = os.path.join(temp_dir, "frame_%05d.png")
+            input_pattern = write_frames(
+                images, temp_dir, frame_format=frame_format, compress_level=png_compress_level,
+                max_workers=frame_workers, to_array=self.convert_frame
+            )
             ffmpeg_cmd = self.build_ffmpeg_command(input_pattern, video_path, fps, config)
 
             # Handle audio based on config
@@ -184,6 +183,12 @@ class ImagesListToVideo:
             audio_data = np.int16(audio_data * 32767)
             wav_file.writeframes(audio_data.tobytes())
 
+    def convert_frame(self, img):
+        img_np = self.convert_to_numpy(img)
+        if img_np.shape[-1] != 3:
+            img_np = self.convert_to_rgb(img_np)
+        return img_np
+
     def convert_to_numpy(self, img):
         if isinstance(img, torch.Tensor):
             img = img.cpu().numpy()
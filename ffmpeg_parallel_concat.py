@@ -0,0 +1,221 @@
+import os
+import shutil
+import subprocess
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from .ffmpeg_probe import probe
+
+# Parallel concat for ConcatVideos / ConcatVideosFromList:
+# probe every input, stream copy when all clips match, otherwise normalize
+# the clips that need it in parallel ffmpeg processes, then stream copy concatenate.
+
+CONCAT_MODES = ["single_ffmpeg", "parallel_stream_copy"]
+
+# Encoder used to normalize a clip to the codec of the other clips
+ENCODERS = {
+    "h264": "libx264",
+    "hevc": "libx265",
+    "vp9": "libvpx-vp9",
+    "vp8": "libvpx",
+    "av1": "libaom-av1",
+    "mpeg4": "mpeg4",
+    "prores": "prores_ks",
+}
+AUDIO_ENCODERS = {
+    "aac": "aac",
+    "mp3": "libmp3lame",
+    "opus": "libopus",
+    "vorbis": "libvorbis",
+}
+
+
+def default_workers():
+    return max(1, min(8, (os.cpu_count() or 2) // 2))
+
+
+def stream_signature(info):
+    """Everything that has to match for the concat demuxer to stream copy clips together."""
+    return (
+        info.video_codec, info.width, info.height, info.pixel_format,
+        info.time_base, round(info.fps, 3),
+        info.has_audio, info.audio_codec if info.has_audio else None,
+        info.sample_rate if info.has_audio else None,
+        info.audio_channels if info.has_audio else None,
+    )
+
+
+def timescale(time_base):
+    """'1/15360' -> '15360', used to keep the mp4 track timebase identical across clips."""
+    if time_base and "/" in time_base:
+        return time_base.split("/", 1)[1]
+    return None
+
+
+def build_normalize_command(ffmpeg_path, input_path, output_path, target, config=None):
+    """
+    ffmpeg command that re-encodes one clip to the target stream parameters.
+
+    target: dict with width, height, fps, pixel_format, time_base, encoder,
+    audio (bool), audio_encoder, sample_rate, audio_channels.
+    config: parsed FFMPEG_CONFIG_JSON, its encoder settings take priority.
+    """
+    info = probe(input_path)
+    cmd = [ffmpeg_path, "-y", "-i", input_path]
+
+    add_silence = target["audio"] and not info.has_audio
+    if add_silence:
+        layout = "mono" if target["audio_channels"] == 1 else "stereo"
+        cmd.extend(["-f", "lavfi", "-i", f"anullsrc=r={target['sample_rate']}:cl={layout}"])
+
+    width, height = target["width"], target["height"]
+    cmd.extend([
+        "-vf",
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={target['fps']}",
+        "-map", "0:v:0",
+    ])
+
+    video_config = (config or {}).get("video", {})
+    cmd.extend(["-c:v", target["encoder"]])
+    if video_config.get("bitrate"):
+        cmd.extend(["-b:v", video_config["bitrate"]])
+    elif video_config.get("crf") is not None:
+        cmd.extend(["-crf", str(video_config["crf"])])
+    if video_config.get("preset") and video_config["preset"] != "None":
+        cmd.extend(["-preset", video_config["preset"]])
+    if target["pixel_format"] and target["pixel_format"] != "N/A":
+        cmd.extend(["-pix_fmt", target["pixel_format"]])
+    track_timescale = timescale(target["time_base"])
+    if track_timescale:
+        cmd.extend(["-video_track_timescale", track_timescale])
+
+    if target["audio"]:
+        cmd.extend(["-map", "1:a:0" if add_silence else "0:a:0"])
+        cmd.extend(["-c:a", target["audio_encoder"], "-ar", str(target["sample_rate"])])
+        if target["audio_channels"]:
+            cmd.extend(["-ac", str(target["audio_channels"])])
+        audio_bitrate = (config or {}).get("audio", {}).get("bitrate")
+        if audio_bitrate:
+            cmd.extend(["-b:a", audio_bitrate])
+        if add_silence:
+            cmd.append("-shortest")
+    else:
+        cmd.append("-an")
+
+    cmd.append(output_path)
+    return cmd
+
+
+def parallel_concat(video_paths, output_path, work_dir, config=None, max_workers=0):
+    """
+    Concatenate video_paths into output_path, running at most max_workers ffmpeg processes at once.
+
+    Without an encoder in config, clips matching the most common stream parameters are
+    stream copied as they are and only the others are re-encoded to match them.
+    If the config changes any of those parameters (resolution, fps, pixel format, audio),
+    every clip is re-encoded.
+    With an encoder in config (FFMPEG_CONFIG_JSON), every clip is encoded in parallel with
+    those settings, then the results are stream copied together.
+    Returns the list of ffmpeg commands that were run, the final concat last.
+    """
+    config = config or {}
+    ffmpeg_path = config.get("ffmpeg", {}).get("path") or "ffmpeg"
+    workers = max_workers if max_workers > 0 else default_workers()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        infos = list(executor.map(probe, video_paths))
+
+    # Reference stream parameters: the most common signature among the inputs
+    signatures = [stream_signature(info) for info in infos]
+    reference = infos[signatures.index(Counter(signatures).most_common(1)[0][0])]
+
+    video_config = config.get("video", {})
+    audio_config = config.get("audio", {})
+    config_codec = video_config.get("codec")
+    reencode_all = bool(config_codec) and config_codec not in ["None", "copy"]
+
+    resolution = video_config.get("resolution") or {}
+    fps_config = video_config.get("fps") or {}
+    target = {
+        "width": resolution.get("width") or reference.width,
+        "height": resolution.get("height") or reference.height,
+        "fps": fps_config.get("force_fps") if fps_config.get("enabled") else reference.fps,
+        "pixel_format": video_config.get("pixel_format") if video_config.get("pixel_format") not in [None, "None"] else reference.pixel_format,
+        "time_base": reference.time_base,
+        "encoder": config_codec if reencode_all else ENCODERS.get(reference.video_codec, "libx264"),
+        "audio": reference.has_audio or any(info.has_audio for info in infos),
+        "audio_encoder": AUDIO_ENCODERS.get(reference.audio_codec, "aac"),
+        "sample_rate": reference.sample_rate or 48000,
+        "audio_channels": reference.audio_channels or 2,
+    }
+    if config.get("audio") is not None and (audio_config.get("enabled") is False or audio_config.get("codec") == "None"):
+        target["audio"] = False
+        reencode_all = reencode_all or any(info.has_audio for info in infos)
+    elif audio_config.get("codec") not in [None, "None", "copy"]:
+        target["audio_encoder"] = audio_config["codec"]
+
+    # Copied clips keep the reference parameters: if the config changes any of them,
+    # copied and normalized clips would differ, so every clip has to be re-encoded
+    if not reencode_all and (
+        (int(target["width"]), int(target["height"])) != (reference.width, reference.height)
+        or round(float(target["fps"]), 3) != round(reference.fps, 3)
+        or target["pixel_format"] != reference.pixel_format
+        or target["audio"] != reference.has_audio
+        or (target["audio"] and target["audio_encoder"] != AUDIO_ENCODERS.get(reference.audio_codec))
+    ):
+        reencode_all = True
+
+    if reference.video_codec not in ENCODERS and not reencode_all:
+        # Unknown reference codec: normalize everything to H.264 so the outputs match each other
+        reencode_all = True
+
+    reference_signature = stream_signature(reference)
+    to_normalize = [
+        i for i, signature in enumerate(signatures)
+        if reencode_all or signature != reference_signature
+    ]
+
+    # Normalized clips go in the container of the reference, to be concatenated with the copied ones.
+    # Clips encoded with another encoder than the reference one (config codec, unknown codec) go in mp4.
+    suffix = ".mp4"
+    if target["encoder"] == ENCODERS.get(reference.video_codec):
+        suffix = Path(reference.path).suffix or ".mp4"
+
+    normalize_dir = Path(work_dir) / f"normalized_{uuid.uuid4().hex}"
+    os.makedirs(normalize_dir, exist_ok=True)
+    try:
+        concat_inputs = list(video_paths)
+        normalize_cmds = {}
+        for i in to_normalize:
+            normalized_path = str(normalize_dir / f"clip_{i:04d}{suffix}")
+            normalize_cmds[i] = build_normalize_command(ffmpeg_path, video_paths[i], normalized_path, target, config)
+            concat_inputs[i] = normalized_path
+
+        def run(cmd):
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+        # Total time is the slowest clip instead of the sum of all of them
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run, normalize_cmds.values()))
+
+        concat_file = normalize_dir / "concat.txt"
+        with open(concat_file, 'w') as f:
+            for path in concat_inputs:
+                f.write(f"file '{path}'\n")
+
+        concat_cmd = [
+            ffmpeg_path, '-y',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(concat_file),
+            '-c', 'copy',
+            '-movflags', '+faststart',
+            str(output_path)
+        ]
+        run(concat_cmd)
+    finally:
+        shutil.rmtree(normalize_dir, ignore_errors=True)
+
+    return list(normalize_cmds.values()) + [concat_cmd]
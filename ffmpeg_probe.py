@@ -0,0 +1,142 @@
+import os
+import json
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Shared ffprobe helper: one "ffprobe -show_streams -show_format -of json" per file,
+# cached by (path, mtime, size) so re-running a workflow on the same clips costs no extra probe.
+
+PROBE_CACHE_SIZE = 256
+
+_probe_cache = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+@dataclass
+class ProbeResult:
+    path: str
+    duration: float = 0.0
+    container_format: str = "N/A"
+    bit_rate: int = 0
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    frame_count: int = 0
+    video_codec: str = "N/A"
+    pixel_format: str = "N/A"
+    video_bit_rate: int = 0
+    time_base: str = ""
+    # Display rotation in degrees (rotate tag or display matrix), ffmpeg applies it when decoding
+    rotation: int = 0
+    audio_codec: str = "N/A"
+    audio_bit_rate: int = 0
+    sample_rate: int = 0
+    audio_channels: int = 0
+    has_video: bool = False
+    has_audio: bool = False
+    raw: dict = field(default_factory=dict, repr=False)
+
+
+def parse_rate(rate):
+    """Parse an ffprobe rational like '30000/1001' without eval."""
+    if not rate or rate == "0/0":
+        return 0.0
+    if "/" in rate:
+        num, den = rate.split("/", 1)
+        return float(num) / float(den) if float(den) != 0 else 0.0
+    return float(rate)
+
+
+def _to_int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def stream_rotation(stream):
+    """Rotation of a video stream: 'rotate' tag (older ffprobe) or display matrix side data."""
+    rotation = _to_int(stream.get("tags", {}).get("rotate"))
+    for side_data in stream.get("side_data_list", []):
+        if "rotation" in side_data:
+            rotation = _to_int(side_data["rotation"])
+    return rotation
+
+
+def parse_probe_data(path, data):
+    """Build a ProbeResult from ffprobe json output."""
+    result = ProbeResult(path=path, raw=data)
+
+    format_data = data.get("format", {})
+    format_name = format_data.get("format_name", "N/A")
+    result.container_format = "mp4" if "mp4" in format_name.lower() else format_name.split(",")[0]
+    result.duration = float(format_data.get("duration", 0) or 0)
+    result.bit_rate = _to_int(format_data.get("bit_rate"))
+
+    for stream in data.get("streams", []):
+        codec_type = stream.get("codec_type")
+        if codec_type == "video" and not result.has_video:
+            result.has_video = True
+            result.width = _to_int(stream.get("width"))
+            result.height = _to_int(stream.get("height"))
+            result.fps = parse_rate(stream.get("r_frame_rate", ""))
+            result.video_codec = stream.get("codec_name", "N/A")
+            result.pixel_format = stream.get("pix_fmt", "N/A")
+            result.video_bit_rate = _to_int(stream.get("bit_rate"))
+            result.time_base = stream.get("time_base", "")
+            result.frame_count = _to_int(stream.get("nb_frames"))
+            result.rotation = stream_rotation(stream)
+            if result.duration == 0.0:
+                result.duration = float(stream.get("duration", 0) or 0)
+        elif codec_type == "audio" and not result.has_audio:
+            result.has_audio = True
+            result.audio_codec = stream.get("codec_name", "N/A")
+            result.audio_bit_rate = _to_int(stream.get("bit_rate"))
+            result.sample_rate = _to_int(stream.get("sample_rate"))
+            result.audio_channels = _to_int(stream.get("channels"))
+
+    # Containers like mkv/webm don't store nb_frames: estimate instead of demuxing with -count_packets
+    if result.has_video and result.frame_count == 0 and result.fps > 0 and result.duration > 0:
+        result.frame_count = int(round(result.duration * result.fps))
+
+    return result
+
+
+def probe(path, ffprobe_path="ffprobe"):
+    """
+    Probe a media file with a single ffprobe call.
+
+    Results are cached by (path, mtime, size), so an unchanged file is only probed once.
+    Raises subprocess.CalledProcessError if ffprobe fails.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, ffprobe_path)
+
+    with _probe_cache_lock:
+        if key in _probe_cache:
+            _probe_cache.move_to_end(key)
+            return _probe_cache[key]
+
+    output = subprocess.run([
+        ffprobe_path, "-v", "error",
+        "-show_streams", "-show_format",
+        "-of", "json",
+        path
+    ], capture_output=True, text=True, check=True).stdout
+    result = parse_probe_data(path, json.loads(output or "{}"))
+
+    with _probe_cache_lock:
+        _probe_cache[key] = result
+        _probe_cache.move_to_end(key)
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+
+    return result
+
+
+def clear_probe_cache():
+    with _probe_cache_lock:
+        _probe_cache.clear()
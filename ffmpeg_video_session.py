@@ -0,0 +1,282 @@
+import os
+import json
+import glob
+import atexit
+import threading
+import subprocess
+import torch
+
+# Long-lived ffmpeg encoder sessions, kept between prompt executions:
+# every append writes its frames straight to the stdin of the same ffmpeg process,
+# so a loop that makes one frame per run never holds the whole video in memory.
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+PIPE_CHUNK_FRAMES = 16
+
+
+class Everything(str):
+    def __ne__(self, __value: object) -> bool:
+        return False
+
+
+def parse_ffmpeg_config(config_json):
+    if not config_json:
+        return None
+    try:
+        return json.loads(config_json)
+    except json.JSONDecodeError:
+        print("Error parsing FFmpeg config JSON")
+        return None
+
+
+def get_next_filename(output_base, format="mp4"):
+    """Next free 'output_base_0001.format' style filename, same numbering as imagesToVideo."""
+    numbers = []
+    for filepath in glob.glob(f"{output_base}_[0-9][0-9][0-9][0-9].{format}"):
+        number_part = os.path.basename(filepath).split('_')[-1].split('.')[0]
+        if number_part.isdigit():
+            numbers.append(int(number_part))
+    return f"{output_base}_{(max(numbers) + 1 if numbers else 1):04d}.{format}"
+
+
+class VideoSession:
+    """One ffmpeg process reading rawvideo on stdin, started with the size of the first frames."""
+
+    def __init__(self, session_id, fps, output_file, ffmpeg_config=None):
+        self.session_id = session_id
+        self.fps = fps
+        self.output_file = output_file
+        self.ffmpeg_config = ffmpeg_config
+        self.process = None
+        self.ffmpeg_cmd = None
+        self.width = None
+        self.height = None
+        self.pix_fmt = None
+        self.frame_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def format(self):
+        return os.path.splitext(self.output_file)[1].lstrip(".")
+
+    def build_command(self, width, height, pix_fmt):
+        config = self.ffmpeg_config
+        ffmpeg_path = "ffmpeg"
+        if config and config["ffmpeg"]["path"]:
+            ffmpeg_path = config["ffmpeg"]["path"]
+
+        cmd = [
+            ffmpeg_path, "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", pix_fmt,
+            "-s", f"{width}x{height}",
+            "-framerate", str(self.fps),
+            "-i", "-",
+        ]
+
+        if config:
+            video = config["video"]
+            if video["codec"] and video["codec"] != "None":
+                cmd.extend(["-c:v", video["codec"]])
+            if video["preset"] and video["preset"] != "None":
+                cmd.extend(["-preset", video["preset"]])
+            if video["bitrate"]:
+                cmd.extend(["-b:v", video["bitrate"]])
+            if video["crf"]:
+                if "nvenc" in (video["codec"] or ""):
+                    cmd.extend(["-cq", str(video["crf"])])
+                else:
+                    cmd.extend(["-crf", str(video["crf"])])
+            if video["pixel_format"] and video["pixel_format"] != "None":
+                cmd.extend(["-pix_fmt", video["pixel_format"]])
+            if video["resolution"]:
+                cmd.extend(["-vf", f"scale={video['resolution']['width']}:{video['resolution']['height']}"])
+            if video["fps"]["enabled"]:
+                cmd.extend(["-r", str(video["fps"]["force_fps"])])
+        elif self.format == "webm":
+            cmd.extend(["-c:v", "libvpx-vp9", "-crf", "19", "-pix_fmt", "yuva420p"])
+        else:
+            cmd.extend(["-c:v", "libx264", "-preset", "medium", "-crf", "19", "-pix_fmt", "yuv420p"])
+
+        if self.format in ["mp4", "mov"]:
+            # Fragmented mp4: what is already written stays playable if ComfyUI stops before finalize
+            cmd.extend(["-movflags", "+frag_keyframe+empty_moov"])
+
+        cmd.extend(["-an", self.output_file])
+        return cmd
+
+    def start(self, images):
+        self.height, self.width = images.shape[1], images.shape[2]
+        self.pix_fmt = "rgba" if images.shape[-1] == 4 or self.format == "webm" else "rgb24"
+        self.ffmpeg_cmd = self.build_command(self.width, self.height, self.pix_fmt)
+        os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
+        self.process = subprocess.Popen(self.ffmpeg_cmd, stdin=subprocess.PIPE)
+
+    def append(self, images):
+        """Write a batch of frames (B, H, W, C) to the running encoder, return the total frame count."""
+        with self.lock:
+            if self.process is None:
+                self.start(images)
+            elif (images.shape[1], images.shape[2]) != (self.height, self.width):
+                raise ValueError(
+                    f"Video session '{self.session_id}' is {self.width}x{self.height}, "
+                    f"got frames of {images.shape[2]}x{images.shape[1]}"
+                )
+            if self.process.poll() is not None:
+                raise subprocess.CalledProcessError(self.process.returncode, self.ffmpeg_cmd)
+
+            # Convert a few frames at a time, the batch is never held as uint8 all at once
+            for start in range(0, images.shape[0], PIPE_CHUNK_FRAMES):
+                chunk = (images[start:start + PIPE_CHUNK_FRAMES].clamp(0, 1) * 255).to(torch.uint8)
+                if self.pix_fmt == "rgba" and chunk.shape[-1] == 3:
+                    alpha = torch.full((*chunk.shape[:-1], 1), 255, dtype=torch.uint8, device=chunk.device)
+                    chunk = torch.cat([chunk, alpha], dim=-1)
+                elif self.pix_fmt == "rgb24" and chunk.shape[-1] == 4:
+                    chunk = chunk[..., :3]
+                try:
+                    self.process.stdin.write(chunk.cpu().contiguous().numpy().tobytes())
+                except BrokenPipeError:
+                    raise subprocess.CalledProcessError(self.process.wait(), self.ffmpeg_cmd)
+                self.frame_count += chunk.shape[0]
+            self.process.stdin.flush()
+            return self.frame_count
+
+    def finalize(self):
+        """Close stdin and wait for ffmpeg to write the end of the file."""
+        with self.lock:
+            if self.process is None:
+                return None
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self.process.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, self.ffmpeg_cmd)
+            return self.output_file
+
+
+def get_session(session_id):
+    with _sessions_lock:
+        return _sessions.get(session_id)
+
+
+def open_session(session_id, fps, name_prefix, ffmpeg_config=None):
+    """Return the open session for session_id, or register a new one writing to the next free filename."""
+    with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            format = "mp4"
+            if ffmpeg_config and ffmpeg_config["output"]["container_format"] not in [None, "None"]:
+                format = ffmpeg_config["output"]["container_format"]
+            output_base = os.path.join("output", os.path.splitext(name_prefix)[0])
+            session = VideoSession(session_id, fps, get_next_filename(output_base, format), ffmpeg_config)
+            _sessions[session_id] = session
+        return session
+
+
+def close_session(session_id):
+    """Finalize and forget a session, return its video path (None if it never received a frame)."""
+    with _sessions_lock:
+        session = _sessions.pop(session_id, None)
+    if session is None:
+        return None
+    return session.finalize()
+
+
+def close_session_quietly(session_id):
+    try:
+        close_session(session_id)
+    except Exception as e:
+        print(f"Video session '{session_id}' closed with an error: {e}")
+
+
+@atexit.register
+def close_all_sessions():
+    # Don't leave half-written files behind when ComfyUI shuts down with sessions still open
+    with _sessions_lock:
+        session_ids = list(_sessions)
+    for session_id in session_ids:
+        try:
+            close_session(session_id)
+        except Exception as e:
+            print(f"Error closing video session '{session_id}': {e}")
+
+
+class AppendFramesToVideoSession:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "images": ("IMAGE",),
+                "session_id": ("STRING", {"default": "video_session"}),
+                "fps": ("FLOAT", {"default": 24, "min": 1, "max": 120}),
+                "name_prefix": ("STRING", {"default": "video_session/me"}),
+            },
+            "optional": {
+                "FFMPEG_CONFIG_JSON": ("STRING", {"forceInput": True}),
+                "finalize": ("BOOLEAN", {"default": False}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT", "STRING",)
+    RETURN_NAMES = ("session_id", "frame_count", "video_path",)
+    FUNCTION = "append_frames"
+    OUTPUT_NODE = True
+    CATEGORY = "Bjornulf"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # Same frame twice in a loop must still be appended twice
+        return float("NaN")
+
+    def append_frames(self, images, session_id, fps, name_prefix, FFMPEG_CONFIG_JSON=None, finalize=False):
+        # fps, name_prefix and FFMPEG_CONFIG_JSON are only used when the session is opened
+        session = open_session(session_id, fps, name_prefix, parse_ffmpeg_config(FFMPEG_CONFIG_JSON))
+        try:
+            frame_count = session.append(images)
+        except Exception:
+            # A broken encoder can't be resumed, start a new file on the next append
+            close_session_quietly(session_id)
+            raise
+        print(f"Video session '{session_id}': {frame_count} frames -> {session.output_file}")
+        if finalize:
+            close_session(session_id)
+        return (session_id, frame_count, session.output_file,)
+
+
+class FinalizeVideoSession:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "session_id": ("STRING", {"default": "video_session"}),
+            },
+            "optional": {
+                "trigger": (Everything("*"), {"forceInput": True}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT",)
+    RETURN_NAMES = ("video_path", "frame_count",)
+    FUNCTION = "finalize"
+    OUTPUT_NODE = True
+    CATEGORY = "Bjornulf"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return float("NaN")
+
+    def finalize(self, session_id, trigger=None):
+        session = get_session(session_id)
+        if session is None:
+            raise ValueError(f"No open video session named '{session_id}'")
+        frame_count = session.frame_count
+        video_path = close_session(session_id)
+        if video_path is None:
+            raise ValueError(f"Video session '{session_id}' was closed before receiving any frame")
+        print(f"Video session '{session_id}' finalized: {video_path} ({frame_count} frames)")
+        return (video_path, frame_count,)
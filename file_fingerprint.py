@@ -0,0 +1,87 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Shared file hash cache for IS_CHANGED checks and other per-file digests:
+# values are cached by (path, size, mtime_ns), so an unchanged file is never read again.
+
+FINGERPRINT_CACHE_SIZE = 1024
+# Hash big files with xxh3 (blake2b without xxhash) instead of sha256: faster, but the values change
+FAST_HASH = False
+# Files at least this big use the fast non-cryptographic hash when fast_hash is enabled
+FAST_HASH_MIN_SIZE = 16 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def file_fingerprint(path):
+    """(absolute path, size, mtime_ns): changes whenever the file is rewritten."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def cached_file_value(path, name, compute):
+    """
+    Return compute() for this file, cached under name until the file changes.
+    compute is only called on a cache miss.
+    """
+    key = file_fingerprint(path) + (name,)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    value = compute()
+
+    with _cache_lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > FINGERPRINT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return value
+
+
+def new_hasher(fast=False):
+    if not fast:
+        return hashlib.sha256()
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_file(path, fast=False):
+    """Hex digest of the file content, read in chunks (sha256, or xxh3/blake2b when fast)."""
+    m = new_hasher(fast)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            m.update(chunk)
+    return m.hexdigest()
+
+
+def file_hash(path, fast_hash=None):
+    """
+    Cached content hash of a file.
+
+    sha256 by default, same value as hashing the file with hashlib directly.
+    With fast_hash (FAST_HASH when not given), files of FAST_HASH_MIN_SIZE bytes or more
+    use xxh3 (blake2b without xxhash) instead.
+    """
+    if fast_hash is None:
+        fast_hash = FAST_HASH
+    fast = fast_hash and os.path.getsize(path) >= FAST_HASH_MIN_SIZE
+    name = "fast_hash" if fast else "sha256"
+    return cached_file_value(path, name, lambda: hash_file(path, fast))
+
+
+def clear_fingerprint_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,66 @@
+import subprocess
+import numpy as np
+import torch
+from .ffmpeg_probe import probe
+
+# Shared in-memory video decode: ffmpeg writes rgb24 rawvideo on stdout,
+# read straight into a preallocated numpy buffer, no frame files on disk.
+
+INITIAL_CAPACITY = 16
+
+
+def read_video_frames(video_path, frame_count=None, ffmpeg_path="ffmpeg"):
+    """
+    Decode all frames of a video as a uint8 tensor of shape (B, H, W, 3).
+
+    The buffer is preallocated from frame_count (or the probed frame count)
+    and grown if the video holds more frames.
+    """
+    info = probe(video_path)
+    width, height = info.width, info.height
+    if not info.has_video or width <= 0 or height <= 0:
+        raise ValueError(f"No video stream found in: {video_path}")
+    # ffmpeg autorotates while decoding: a +-90 degree clip (portrait phone video) comes out with width and height swapped
+    if info.rotation % 180 == 90:
+        width, height = height, width
+    if not frame_count:
+        frame_count = info.frame_count
+    frame_size = width * height * 3
+
+    ffmpeg_cmd = [
+        ffmpeg_path, '-v', 'error',
+        '-i', video_path,
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-'
+    ]
+    process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE)
+
+    capacity = frame_count if frame_count and frame_count > 0 else INITIAL_CAPACITY
+    frames = np.empty((capacity, height, width, 3), dtype=np.uint8)
+    count = 0
+    try:
+        while True:
+            if count >= capacity:
+                capacity *= 2
+                grown = np.empty((capacity, height, width, 3), dtype=np.uint8)
+                grown[:count] = frames[:count]
+                frames = grown
+
+            frame_view = memoryview(frames[count]).cast('B')
+            bytes_read = 0
+            while bytes_read < frame_size:
+                n = process.stdout.readinto(frame_view[bytes_read:])
+                if not n:
+                    break
+                bytes_read += n
+            if bytes_read < frame_size:
+                break
+            count += 1
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, ffmpeg_cmd)
+
+    return torch.from_numpy(frames[:count])
@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+from PIL import Image
+
+# Shared frame dump for nodes that still hand ffmpeg an on-disk image sequence.
+# Frames are encoded in a thread pool (PIL/zlib release the GIL while encoding).
+# For intermediates that ffmpeg reads only once, bmp/ppm skip compression entirely.
+
+FRAME_FORMATS = ["png", "bmp", "ppm"]
+
+
+def default_workers():
+    return min(8, os.cpu_count() or 1)
+
+
+def frame_to_array(frame):
+    """Convert one HWC frame (float in [0, 1] or uint8, tensor or numpy) to a uint8 numpy array."""
+    if isinstance(frame, torch.Tensor):
+        if frame.dtype != torch.uint8:
+            frame = (frame.clamp(0, 1) * 255).to(torch.uint8)
+        return frame.cpu().numpy()
+    if frame.dtype != np.uint8:
+        frame = (np.clip(frame, 0, 1) * 255).astype(np.uint8)
+    return frame
+
+
+def write_frames(images, directory, name="frame_%05d", frame_format="png", compress_level=1,
+                 max_workers=0, start_number=0, rgba=False, to_array=frame_to_array):
+    """
+    Write a batch of frames to directory and return the ffmpeg input pattern for them.
+
+    images: IMAGE tensor [B, H, W, C] or any sequence of frames accepted by to_array.
+    frame_format: "png" (compress_level 0-9), "bmp" or "ppm" (uncompressed, ppm is RGB only).
+    max_workers: number of encoding threads, 0 = automatic.
+    rgba: force an alpha channel (e.g. webm with transparency).
+    """
+    if frame_format not in FRAME_FORMATS:
+        raise ValueError(f"Unsupported frame format: {frame_format}. Supported formats: {', '.join(FRAME_FORMATS)}")
+    if rgba and frame_format == "ppm":
+        # PPM has no alpha channel, fall back to uncompressed PNG
+        frame_format = "png"
+        compress_level = 0
+
+    os.makedirs(directory, exist_ok=True)
+    pattern = os.path.join(directory, f"{name}.{frame_format}")
+
+    def save(index):
+        img = Image.fromarray(to_array(images[index]))
+        if rgba:
+            img = img.convert("RGBA")
+        elif frame_format == "ppm" and img.mode != "RGB":
+            img = img.convert("RGB")
+        path = pattern % (index + start_number)
+        if frame_format == "png":
+            img.save(path, compress_level=compress_level)
+        else:
+            img.save(path)
+
+    workers = max_workers if max_workers > 0 else default_workers()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # list() re-raises the first error from a worker
+        list(executor.map(save, range(len(images))))
+
+    return pattern
@@ -1,7 +1,4 @@
-import numpy as np
-from PIL import Image
 import torch
-import torchvision.transforms as transforms
 
 class GreenScreenToTransparency:
     @classmethod
@@ -11,6 +8,11 @@ class GreenScreenToTransparency:
                 "image": ("IMAGE", {}),
                 "threshold": ("FLOAT", {"default": 0.1, "min": 0.0, "max": 1.0, "step": 0.01}),
             },
+            "optional": {
+                "soft_edge": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 1.0, "step": 0.01}),
+                "spill_suppression": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 1.0, "step": 0.01}),
+                "device": (["auto", "cpu", "cuda"], {"default": "auto"}),
+            },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
 
@@ -19,30 +21,25 @@ class GreenScreenToTransparency:
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def remove_green_screen(self, image, threshold=0.1, prompt=None, extra_pnginfo=None):
-        # Ensure the input image is on CPU and convert to numpy array
-        image_np = image.cpu().numpy()
-        
-        # Check if the image is in the format [batch, height, width, channel]
-        if image_np.ndim == 4:
-            # If so, we'll process each image in the batch
-            processed_images = []
-            for img in image_np:
-                processed_img = self._process_single_image(img, threshold)
-                processed_images.append(processed_img)
-            
-            # Stack the processed images back into a batch
-            processed_batch = np.stack(processed_images)
-            # Convert to torch tensor
-            processed_tensor = torch.from_numpy(processed_batch)
-        else:
-            # If it's a single image, process it directly
-            processed_np = self._process_single_image(image_np, threshold)
-            # Add batch dimension if it was originally present
-            if image.dim() == 4:
-                processed_np = np.expand_dims(processed_np, axis=0)
-            # Convert to torch tensor
-            processed_tensor = torch.from_numpy(processed_np)
+    def get_device(self, image, device):
+        """auto = where the image already is, cuda falls back to cpu when not available."""
+        if device == "cuda" and torch.cuda.is_available():
+            return torch.device("cuda")
+        if device == "cpu":
+            return torch.device("cpu")
+        return image.device
+
+    def remove_green_screen(self, image, threshold=0.1, soft_edge=0.0, spill_suppression=0.0, device="auto", prompt=None, extra_pnginfo=None):
+        single_image = image.dim() == 3
+        images = image.unsqueeze(0) if single_image else image
+
+        processed_tensor = self.key_batch(
+            images.to(self.get_device(images, device)),
+            threshold, soft_edge, spill_suppression
+        ).to(image.device)
+
+        if single_image:
+            processed_tensor = processed_tensor.squeeze(0)
 
         # Update metadata if needed
         if extra_pnginfo is not None:
@@ -50,27 +47,34 @@ class GreenScreenToTransparency:
 
         return (processed_tensor, prompt, extra_pnginfo)
 
-    def _process_single_image(self, img, threshold):
-        # Convert to PIL Image
-        pil_img = Image.fromarray((img * 255).astype(np.uint8))
-        
-        # Convert the image to RGBA mode
-        pil_img = pil_img.convert("RGBA")
-        
-        # Get image data as numpy array
-        data = np.array(pil_img)
-        
-        # Create a mask for green pixels
-        r, g, b, a = data[:,:,0], data[:,:,1], data[:,:,2], data[:,:,3]
-        mask = (g > r + threshold * 255) & (g > b + threshold * 255)
-        
-        # Set alpha channel to 0 for green pixels
-        data[:,:,3] = np.where(mask, 0, a)
-        
-        # Create a new image with the updated data
-        result = Image.fromarray(data)
-        
-        # Convert back to numpy and normalize
-        processed_np = np.array(result).astype(np.float32) / 255.0
-        
-        return processed_np
\ No newline at end of file
+    def key_batch(self, images, threshold, soft_edge=0.0, spill_suppression=0.0):
+        """
+        Chroma key the whole [B, H, W, C] batch at once, returns RGBA [B, H, W, 4].
+
+        A pixel is keyed out when green exceeds both red and blue by more than threshold.
+        soft_edge > 0 fades alpha out over green dominance in [threshold - soft_edge, threshold]
+        instead of cutting at threshold, spill_suppression pulls the remaining green towards max(red, blue).
+        """
+        images = images.float()
+        r, g, b = images[..., 0], images[..., 1], images[..., 2]
+        B, H, W = r.shape
+
+        result = torch.empty((B, H, W, 4), dtype=torch.float32, device=images.device)
+        result[..., :3] = images[..., :3]
+
+        # How much green dominates the other two channels: min(g - r, g - b) in one op
+        green_dominance = g - torch.maximum(r, b)
+
+        if soft_edge > 0:
+            alpha = ((threshold - green_dominance) / soft_edge).clamp_(0.0, 1.0)
+        else:
+            alpha = green_dominance <= threshold
+        if images.shape[-1] == 4:
+            result[..., 3] = images[..., 3] * alpha
+        else:
+            result[..., 3] = alpha
+
+        if spill_suppression > 0:
+            result[..., 1].sub_(green_dominance.clamp_(min=0.0).mul_(spill_suppression))
+
+        return result
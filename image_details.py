@@ -1,8 +1,12 @@
 import torch
-import numpy as np
+import json
 from PIL import Image
 import io
 
+# PIL mode of an HxWxC uint8 array, by channel count
+TENSOR_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+STATS_CHUNK_FRAMES = 16
+
 class ImageDetails:
     @classmethod
     def INPUT_TYPES(cls):
@@ -10,90 +14,151 @@ class ImageDetails:
             "required": {
                 "image_input": ("IMAGE",),
             },
+            "optional": {
+                "compute_stats": ("BOOLEAN", {"default": False}),
+                "histogram_bins": ("INT", {"default": 16, "min": 2, "max": 256}),
+            },
         }
 
-    RETURN_TYPES = ("INT", "INT", "BOOL", "STRING", "STRING", "STRING")
-    RETURN_NAMES = ("WIDTH", "HEIGHT", "HAS_TRANSPARENCY", "ORIENTATION", "TYPE", "ALL")
+    RETURN_TYPES = ("INT", "INT", "BOOL", "STRING", "STRING", "STRING", "STRING")
+    RETURN_NAMES = ("WIDTH", "HEIGHT", "HAS_TRANSPARENCY", "ORIENTATION", "TYPE", "ALL", "STATS")
     FUNCTION = "show_image_details"
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def show_image_details(self, image_input):
+    def show_image_details(self, image_input, compute_stats=False, histogram_bins=16):
         if isinstance(image_input, torch.Tensor):
-            is_tensor = True
-            input_type = "tensor"
-            # Ensure the tensor is on CPU and convert to numpy
-            image_input = image_input.cpu().numpy()
-        elif isinstance(image_input, (bytes, bytearray)):
-            is_tensor = False
-            input_type = "bytes"
+            return self.tensor_details(image_input, compute_stats, histogram_bins)
+
+        if isinstance(image_input, (bytes, bytearray)):
             image_input = [image_input]  # Wrap single bytes object in a list
-        else:
-            is_tensor = False
-            input_type = "bytes"
-        
+        input_type = "bytes"
+
         all_widths, all_heights, all_transparencies, all_details, all_orientations = [], [], [], [], []
 
-        if is_tensor:
-            # Handle tensor images
-            if len(image_input.shape) == 5:  # (batch, 1, channels, height, width)
-                image_input = np.squeeze(image_input, axis=1)
-            
-            batch_size = image_input.shape[0]
-            for i in range(batch_size):
-                image = image_input[i]
-                
-                # Ensure the image is in HxWxC format
-                if image.shape[0] == 3 or image.shape[0] == 4:  # If it's in CxHxW format
-                    image = np.transpose(image, (1, 2, 0))  # Change to HxWxC
-                
-                # Normalize to 0-255 range if necessary
-                if image.max() <= 1:
-                    image = (image * 255).astype('uint8')
-                else:
-                    image = image.astype('uint8')
-                
-                pil_image = Image.fromarray(image)
-                self.process_image(pil_image, input_type, all_widths, all_heights, all_transparencies, all_details, all_orientations)
-        else:
-            # Handle bytes-like objects
-            batch_size = len(image_input)
-            for i in range(batch_size):
-                pil_image = Image.open(io.BytesIO(image_input[i]))
-                self.process_image(pil_image, input_type, all_widths, all_heights, all_transparencies, all_details, all_orientations)
+        # Handle bytes-like objects
+        batch_size = len(image_input)
+        for i in range(batch_size):
+            pil_image = Image.open(io.BytesIO(image_input[i]))
+            self.process_image(pil_image, input_type, all_widths, all_heights, all_transparencies, all_details, all_orientations)
 
         # Combine all details into a single string
         combined_details = "\n".join(all_details)
 
         # Return the details of the first image, plus the combined details string
-        return (all_widths[0], all_heights[0], all_transparencies[0], all_orientations[0], 
-                input_type, combined_details)
+        return (all_widths[0], all_heights[0], all_transparencies[0], all_orientations[0],
+                input_type, combined_details, "")
 
-    def process_image(self, pil_image, input_type, all_widths, all_heights, all_transparencies, all_details, all_orientations):
-        # Get image details
-        width, height = pil_image.size
-        has_transparency = pil_image.mode in ('RGBA', 'LA') or \
-                           (pil_image.mode == 'P' and 'transparency' in pil_image.info)
+    def tensor_details(self, images, compute_stats=False, histogram_bins=16):
+        """Details straight from the tensor shape: every frame of a batch has the same size and mode."""
+        input_type = "tensor"
+        if images.dim() == 5:  # (batch, 1, height, width, channels)
+            images = images.squeeze(1)
+        if images.dim() == 3:  # Single image without batch dimension
+            images = images.unsqueeze(0)
+        # Ensure the images are in BxHxWxC format
+        if images.shape[1] in (3, 4) and images.shape[-1] not in (1, 2, 3, 4):  # If it's in BxCxHxW format
+            images = images.movedim(1, -1)
 
-        # Determine orientation
+        batch_size, height, width, channels = images.shape
+        mode = TENSOR_MODES.get(channels, f"{channels} channels")
+        has_transparency = mode in ('RGBA', 'LA')
+        orientation = self.get_orientation(width, height)
+
+        details = self.format_details(input_type, width, height, has_transparency, mode, orientation)
+        combined_details = "\n".join([details] * batch_size)
+
+        stats = ""
+        if compute_stats:
+            stats = json.dumps(self.compute_stats(images, histogram_bins, has_transparency), indent=2)
+
+        return (width, height, has_transparency, orientation, input_type, combined_details, stats)
+
+    def compute_stats(self, images, histogram_bins=16, has_alpha=False):
+        """
+        Per-frame mean/min/max/std, histogram and transparent pixel fraction, computed in torch.
+        Color stats exclude the alpha channel, frames are processed a chunk at a time to bound memory.
+        """
+        batch_size = images.shape[0]
+        color_channels = images.shape[-1] - 1 if has_alpha else images.shape[-1]
+        means, mins, maxs, stds, histograms, transparent = [], [], [], [], [], []
+
+        for start in range(0, batch_size, STATS_CHUNK_FRAMES):
+            chunk = images[start:start + STATS_CHUNK_FRAMES]
+            color = chunk[..., :color_channels].reshape(chunk.shape[0], -1).float()
+
+            frames, values = color.shape
+            mean = color.mean(dim=1)
+            means.append(mean)
+            mins.append(color.amin(dim=1))
+            maxs.append(color.amax(dim=1))
+            # One pass std from the sum of squares (values are in [0, 1], no precision issue)
+            mean_square = torch.linalg.vector_norm(color, dim=1).square_() / values
+            variance = (mean_square - mean * mean).clamp_(min=0) * (values / max(values - 1, 1))
+            stds.append(variance.sqrt_())
+
+            # Histogram of every frame at once: bin index offset by frame, counted with a single bincount
+            bins = (color * histogram_bins).clamp_(0, histogram_bins - 1).long()
+            bins += (torch.arange(frames, device=color.device) * histogram_bins).unsqueeze(1)
+            counts = torch.bincount(bins.view(-1), minlength=frames * histogram_bins)
+            histograms.append(counts.view(frames, histogram_bins).float() / values)
+
+            if has_alpha:
+                alpha = chunk[..., -1].reshape(chunk.shape[0], -1)
+                transparent.append((alpha < 1 / 255).float().mean(dim=1))
+            else:
+                transparent.append(torch.zeros(chunk.shape[0], device=color.device))
+
+        per_frame = {
+            "mean": torch.cat(means),
+            "min": torch.cat(mins),
+            "max": torch.cat(maxs),
+            "std": torch.cat(stds),
+            "transparent_fraction": torch.cat(transparent),
+        }
+        return {
+            "frames": batch_size,
+            "batch": {
+                "mean": round(per_frame["mean"].mean().item(), 6),
+                "min": round(per_frame["min"].min().item(), 6),
+                "max": round(per_frame["max"].max().item(), 6),
+                "transparent_fraction": round(per_frame["transparent_fraction"].mean().item(), 6),
+            },
+            "per_frame": {
+                **{name: [round(v, 6) for v in values.tolist()] for name, values in per_frame.items()},
+                "histogram": [[round(v, 6) for v in row] for row in torch.cat(histograms).tolist()],
+            },
+        }
+
+    def get_orientation(self, width, height):
         if width > height:
-            orientation = "landscape"
+            return "landscape"
         elif height > width:
-            orientation = "portrait"
-        else:
-            orientation = "square"
+            return "portrait"
+        return "square"
 
+    def format_details(self, input_type, width, height, has_transparency, mode, orientation):
         # Prepare the ALL string
         details = f"\nType: {input_type}"
         details += f"\nWidth: {width}"
         details += f"\nHeight: {height}"
         details += f"\nNumber of Pixels: {width * height}"
         details += f"\nLoaded with transparency: {has_transparency}"
-        details += f"\nImage Mode: {pil_image.mode}"
+        details += f"\nImage Mode: {mode}"
         details += f"\nOrientation: {orientation}\n"
+        return details
+
+    def process_image(self, pil_image, input_type, all_widths, all_heights, all_transparencies, all_details, all_orientations):
+        # Get image details
+        width, height = pil_image.size
+        has_transparency = pil_image.mode in ('RGBA', 'LA') or \
+                           (pil_image.mode == 'P' and 'transparency' in pil_image.info)
+
+        # Determine orientation
+        orientation = self.get_orientation(width, height)
 
         all_widths.append(width)
         all_heights.append(height)
         all_transparencies.append(has_transparency)
-        all_details.append(details)
+        all_details.append(self.format_details(input_type, width, height, has_transparency, pil_image.mode, orientation))
         all_orientations.append(orientation)
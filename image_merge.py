@@ -0,0 +1,97 @@
+import math
+import numpy as np
+import torch
+
+# Shared N-input image merge for MergeImagesHorizontally / MergeImagesVertically / CombineImages:
+# the output size is computed once, allocated once on the inputs' device,
+# and every input is copied into place with a single slice assignment.
+
+MERGE_LAYOUTS = ["horizontal", "vertical", "grid"]
+
+
+def to_image_tensor(image, device=None):
+    """IMAGE as a float32 (B, H, W, C) tensor, from a tensor or numpy array (uint8, bool or float)."""
+    if isinstance(image, np.ndarray):
+        image = torch.from_numpy(image)
+    if image.dtype == torch.uint8:
+        image = image.float() / 255.0
+    elif image.dtype != torch.float32:
+        image = image.float()
+    if image.dim() == 3:
+        image = image.unsqueeze(0)
+    if image.shape[-1] not in (1, 3, 4) and image.shape[1] in (1, 3, 4):
+        # (B, C, H, W) -> (B, H, W, C)
+        image = image.permute(0, 2, 3, 1)
+    return image.to(device) if device is not None else image
+
+
+def grid_positions(sizes, columns):
+    """Top-left (y, x) of each (height, width) in a grid, rows/columns as tall/wide as their largest image."""
+    rows = math.ceil(len(sizes) / columns)
+    row_heights = [0] * rows
+    column_widths = [0] * columns
+    for i, (height, width) in enumerate(sizes):
+        row_heights[i // columns] = max(row_heights[i // columns], height)
+        column_widths[i % columns] = max(column_widths[i % columns], width)
+    row_starts = np.concatenate([[0], np.cumsum(row_heights)]).tolist()
+    column_starts = np.concatenate([[0], np.cumsum(column_widths)]).tolist()
+    positions = [(row_starts[i // columns], column_starts[i % columns]) for i in range(len(sizes))]
+    return positions, row_starts[-1], column_starts[-1]
+
+
+def merge_positions(sizes, layout="horizontal", columns=0):
+    """Top-left (y, x) of every image and the (height, width) of the merged canvas."""
+    if layout == "horizontal":
+        x_starts = np.concatenate([[0], np.cumsum([width for _, width in sizes])]).tolist()
+        return [(0, x) for x in x_starts[:-1]], max(height for height, _ in sizes), x_starts[-1]
+    if layout == "vertical":
+        y_starts = np.concatenate([[0], np.cumsum([height for height, _ in sizes])]).tolist()
+        return [(y, 0) for y in y_starts[:-1]], y_starts[-1], max(width for _, width in sizes)
+    if layout == "grid":
+        columns = columns if columns > 0 else math.ceil(math.sqrt(len(sizes)))
+        return grid_positions(sizes, min(columns, len(sizes)))
+    raise ValueError(f"Unknown layout: {layout}. Supported layouts: {', '.join(MERGE_LAYOUTS)}")
+
+
+def merge_images(images, layout="horizontal", columns=0):
+    """
+    Merge a list of IMAGE batches into one canvas per frame.
+
+    Batch sizes may differ: the output has the largest batch size, a shorter batch
+    holds its last frame (a single image is used for every frame).
+    Channels: RGBA output if any input has alpha, RGB inputs are then fully opaque.
+    Empty space is black (transparent for RGBA).
+    """
+    device = images[0].device if isinstance(images[0], torch.Tensor) else None
+    images = [to_image_tensor(image, device) for image in images]
+
+    batch_size = max(image.shape[0] for image in images)
+    channels = 4 if any(image.shape[-1] == 4 for image in images) else 3
+    positions, height, width = merge_positions([image.shape[1:3] for image in images], layout, columns)
+
+    merged = torch.zeros((batch_size, height, width, channels), dtype=torch.float32, device=images[0].device)
+    for image, (y, x) in zip(images, positions):
+        b, h, w, c = image.shape
+        if b != batch_size and b != 1:
+            # Hold the last frame, b == 1 broadcasts on its own
+            image = image[torch.arange(batch_size, device=image.device).clamp(max=b - 1)]
+        if c == 1:
+            image = image.expand(-1, -1, -1, 3)
+            c = 3
+        merged[:, y:y + h, x:x + w, :min(c, channels)] = image[..., :channels]
+        if c < channels:
+            merged[:, y:y + h, x:x + w, 3] = 1.0
+    return merged
+
+
+def stack_images(images):
+    """Concatenate IMAGE batches of the same resolution into one batch, in a single preallocated tensor."""
+    device = images[0].device if isinstance(images[0], torch.Tensor) else None
+    images = [to_image_tensor(image, device) for image in images]
+    total = sum(image.shape[0] for image in images)
+    stacked = torch.empty((total, *images[0].shape[1:]), dtype=torch.float32, device=images[0].device)
+    start = 0
+    for image in images:
+        stacked[start:start + image.shape[0]] = image
+        start += image.shape[0]
+    return stacked
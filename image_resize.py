@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import torch
+import torch.nn.functional as F
+from PIL import Image
+from .frame_writer import default_workers
+
+# Shared batch resize for ResizeImage / ResizeImagePercentage:
+# torch methods resize the whole batch in one interpolate call on the image's device,
+# "lanczos (PIL)" keeps the exact PIL result, one frame per thread (PIL releases the GIL while resizing).
+
+RESIZE_METHODS = ["lanczos (PIL)", "bicubic", "bilinear", "area", "nearest-exact"]
+
+
+def resize_frame_pil(frame, width, height):
+    pil_img = Image.fromarray((frame * 255).astype(np.uint8))
+    resized_pil = pil_img.resize((width, height), Image.LANCZOS)
+    return np.asarray(resized_pil, dtype=np.float32) / 255.0
+
+
+def resize_images_pil(images, width, height, max_workers=0):
+    """LANCZOS resize of a [B, H, W, C] batch with PIL, frames spread over a thread pool."""
+    images_np = images.cpu().numpy()
+    resized = torch.empty((images_np.shape[0], height, width, images_np.shape[-1]), dtype=torch.float32)
+    resized_np = resized.numpy()
+
+    def resize_one(index):
+        resized_np[index] = resize_frame_pil(images_np[index], width, height)
+
+    workers = max_workers if max_workers > 0 else default_workers()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(resize_one, range(images_np.shape[0])))
+    return resized
+
+
+def resize_images_torch(images, width, height, method="bicubic", antialias=True):
+    """Resize a [B, H, W, C] batch with a single torch interpolate call, on the batch's device."""
+    interpolate_args = {"size": (height, width), "mode": method}
+    if method in ["bilinear", "bicubic"]:
+        interpolate_args["align_corners"] = False
+        # antialias only matters (and is only supported) for downscaling with these two modes
+        interpolate_args["antialias"] = antialias
+    resized = F.interpolate(images.movedim(-1, 1).float(), **interpolate_args)
+    if method == "bicubic":
+        # Bicubic overshoots around sharp edges
+        resized = resized.clamp_(0.0, 1.0)
+    return resized.movedim(1, -1).contiguous()
+
+
+def resize_images(images, width, height, method="lanczos (PIL)", antialias=True, max_workers=0):
+    """Resize an IMAGE batch [B, H, W, C] (or a single [H, W, C] image) to width x height."""
+    single_image = images.dim() == 3
+    if single_image:
+        images = images.unsqueeze(0)
+
+    if method == "lanczos (PIL)":
+        resized = resize_images_pil(images, width, height, max_workers)
+    elif method in RESIZE_METHODS:
+        resized = resize_images_torch(images, width, height, method, antialias)
+    else:
+        raise ValueError(f"Unknown resize method: {method}. Supported methods: {', '.join(RESIZE_METHODS)}")
+
+    return resized.squeeze(0) if single_image else resized
@@ -1,4 +1,21 @@
+import os
+import math
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import torch
+import torch.nn.functional as F
+from PIL import Image
+import folder_paths
 from nodes import PreviewImage
+from .file_fingerprint import new_hasher
+
+PREVIEW_MODES = ["full (PNG)", "thumbnails", "contact_sheet"]
+PREVIEW_FORMATS = ["jpeg", "webp"]
+PREVIEW_CACHE_SIZE = 16
+
+# (tensor hash, preview settings) -> ui entries of the saved previews
+_preview_cache = OrderedDict()
 
 class FourImageViewer(PreviewImage):
     """A node that compares four images in the UI."""
@@ -16,18 +33,95 @@ class FourImageViewer(PreviewImage):
                 "image_2": ("IMAGE",),
                 "image_3": ("IMAGE",),
                 "image_4": ("IMAGE",),
+                "preview_mode": (PREVIEW_MODES, {"default": "full (PNG)"}),
+                "preview_format": (PREVIEW_FORMATS, {"default": "jpeg"}),
+                "quality": ("INT", {"default": 85, "min": 1, "max": 100}),
+                "max_size": ("INT", {"default": 512, "min": 64, "max": 4096, "step": 8}),
             }
         }
 
-    def compare_images(self, **kwargs):
+    def compare_images(self, preview_mode="full (PNG)", preview_format="jpeg", quality=85, max_size=512, **kwargs):
         result = {"ui": {}}
-        
+
         for i in range(1, 5):
             image_key = f"image_{i}"
             image_data = kwargs.get(image_key)
-            
+
             if image_data is not None and len(image_data) > 0:
-                saved_images = self.save_images(image_data)
-                result["ui"][f"images_{i}"] = saved_images["ui"]["images"]
+                if preview_mode == "full (PNG)":
+                    saved_images = self.save_images(image_data)
+                    result["ui"][f"images_{i}"] = saved_images["ui"]["images"]
+                else:
+                    result["ui"][f"images_{i}"] = self.cached_previews(image_data, preview_mode, preview_format, quality, max_size)
+
+        return result
+
+    def tensor_hash(self, images):
+        """Hash of every value of the batch (xxh3, blake2b without xxhash), with its shape and dtype."""
+        m = new_hasher(fast=True)
+        m.update(str((tuple(images.shape), images.dtype)).encode())
+        m.update(images.detach().cpu().contiguous().numpy().reshape(-1).view(np.uint8))
+        return m.hexdigest()
+
+    def cached_previews(self, images, preview_mode, preview_format, quality, max_size):
+        """Previews of a batch, reused as long as the same batch is compared with the same settings."""
+        key = (self.tensor_hash(images), preview_mode, preview_format, quality, max_size)
+        temp_dir = folder_paths.get_temp_directory()
+        cached = _preview_cache.get(key)
+        if cached and all(os.path.exists(os.path.join(temp_dir, entry["filename"])) for entry in cached):
+            _preview_cache.move_to_end(key)
+            return cached
+
+        frames = self.make_thumbnails(images, preview_mode, max_size)
+        previews = [self.save_preview(frame, preview_format, quality) for frame in frames]
+
+        _preview_cache[key] = previews
+        while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+        return previews
+
+    def make_thumbnails(self, images, preview_mode, max_size):
+        """
+        Downscale the whole batch in one interpolate call, as uint8 (B, h, w, C).
+        contact_sheet tiles the thumbnails into a single grid image (1, rows * h, columns * w, C).
+        """
+        B, H, W, C = images.shape
+        columns = math.ceil(math.sqrt(B)) if preview_mode == "contact_sheet" else 1
+        rows = math.ceil(B / columns)
+        # The thumbnails (or the whole contact sheet) fit in max_size x max_size
+        scale = min(1.0, max_size / (max(H, W) * columns))
+        height, width = max(1, round(H * scale)), max(1, round(W * scale))
+
+        thumbnails = images.movedim(-1, 1).float()
+        if (height, width) != (H, W):
+            thumbnails = F.interpolate(thumbnails, size=(height, width), mode="area")
+        thumbnails = (thumbnails.clamp(0, 1) * 255).round().to(torch.uint8).movedim(1, -1)
+
+        if preview_mode == "contact_sheet":
+            # Empty cells stay black, then (rows, columns, h, w, C) -> (rows * h, columns * w, C)
+            sheet = torch.zeros((rows * columns, height, width, C), dtype=torch.uint8, device=thumbnails.device)
+            sheet[:B] = thumbnails
+            sheet = sheet.view(rows, columns, height, width, C).permute(0, 2, 1, 3, 4)
+            thumbnails = sheet.reshape(1, rows * height, columns * width, C)
+
+        return thumbnails.cpu()
+
+    def save_preview(self, frame, preview_format, quality):
+        """Encode one uint8 frame to the temp folder, named after its content: identical previews are encoded once."""
+        pixels = frame.numpy()
+        if preview_format == "jpeg" and pixels.shape[-1] == 4:
+            pixels = pixels[..., :3]  # No alpha in JPEG
+        if pixels.shape[-1] == 1:
+            pixels = pixels[..., 0]
+
+        content_hash = hashlib.md5(pixels.tobytes()).hexdigest()
+        extension = "jpg" if preview_format == "jpeg" else "webp"
+        filename = f"bjornulf_compare_{content_hash}_{quality}.{extension}"
+        temp_dir = folder_paths.get_temp_directory()
+        file_path = os.path.join(temp_dir, filename)
+
+        if not os.path.exists(file_path):
+            os.makedirs(temp_dir, exist_ok=True)
+            Image.fromarray(pixels).save(file_path, format=preview_format.upper(), quality=quality)
 
-        return result
\ No newline at end of file
+        return {"filename": filename, "subfolder": "", "type": "temp"}
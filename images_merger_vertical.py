@@ -1,6 +1,4 @@
-import torch
-import numpy as np
-from PIL import Image
+from .image_merge import merge_images
 
 class MergeImagesVertically:
     @classmethod
@@ -29,18 +27,7 @@ class MergeImagesVertically:
         if image4 is not None:
             images.append(image4)
         
-        # Calculate the total width and maximum height
-        total_width = sum(img.shape[1] for img in images)
-        max_height = max(img.shape[2] for img in images)
-        
-        # Create a new tensor for the combined image
-        combined_image = torch.zeros((images[0].shape[0], total_width, max_height, 3), dtype=images[0].dtype, device=images[0].device)
-        
-        # Paste images side by side
-        current_x = 0
-        for img in images:
-            w, h = img.shape[1:3]
-            combined_image[:, current_x:current_x+w, :h, :] = img[:, :, :, :]
-            current_x += w
-        
-        return (combined_image,)
\ No newline at end of file
+        # One allocation for the merged batch, one slice copy per image
+        combined_image = merge_images(images, "vertical")
+
+        return (combined_image,)
@@ -1,10 +1,10 @@
 import os
-import hashlib
 import numpy as np
 from PIL import Image, ImageOps, ImageSequence
 import torch
 import folder_paths
 import node_helpers
+from .file_fingerprint import file_hash
 
 class LoadImageWithTransparency:
     @classmethod
@@ -67,10 +67,7 @@ class LoadImageWithTransparency:
     @classmethod
     def IS_CHANGED(s, image):
         image_path = folder_paths.get_annotated_filepath(image)
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        return m.digest().hex()
+        return file_hash(image_path)
 
     @classmethod
     def VALIDATE_INPUTS(s, image):
@@ -1,84 +1,165 @@
 import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PIL import Image, ImageSequence, ImageOps
 import torch
 
 from aiohttp import web
 from server import PromptServer
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+# Folder listings cached by directory mtime: adding, removing or renaming a file changes the
+# mtime of its directory, so an unchanged folder is never listed again, only stat'ed.
+_folder_index = {}
+_folder_index_lock = threading.Lock()
+
+
+def get_output_dir():
+    # ComfyUI output directory, relative to where this script is located
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    comfyui_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
+    return os.path.join(comfyui_root, 'output')
+
+
+def scan_folder(folder_path):
+    """(sorted image files, subdirectories) of a folder, listed again only when its mtime changed."""
+    try:
+        mtime = os.stat(folder_path).st_mtime_ns
+    except OSError:
+        return [], []
+
+    with _folder_index_lock:
+        cached = _folder_index.get(folder_path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    image_files, subdirs = [], []
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    image_files.append(entry.name)
+    except OSError:
+        return [], []
+    image_files.sort()
+
+    with _folder_index_lock:
+        _folder_index[folder_path] = (mtime, image_files, subdirs)
+    return image_files, subdirs
+
+
+def list_image_folders(output_dir):
+    """[(display name with image count, relative path)] of every folder with images, sorted case-insensitive."""
+    folders = []
+    pending = [output_dir]
+    while pending:
+        folder_path = pending.pop()
+        image_files, subdirs = scan_folder(folder_path)
+        pending.extend(os.path.join(folder_path, subdir) for subdir in subdirs)
+
+        rel_path = os.path.relpath(folder_path, output_dir)
+        if rel_path != '.' and image_files:
+            folders.append((f"{rel_path} ({len(image_files)} images)", rel_path))
+
+    folders.sort(key=lambda x: x[0].lower())
+    return folders
+
+
+def image_frame_sizes(image_path):
+    """Size (width, height) of every frame of an image file, read from the header only."""
+    with Image.open(image_path) as img:
+        width, height = img.size
+        # EXIF orientations 5 to 8 are rotated by 90 degrees, exif_transpose swaps width and height
+        if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        return [(width, height)] * getattr(img, "n_frames", 1)
+
+
+def decode_image_into(image_path, targets):
+    """Decode every frame of an image file straight into its preallocated float32 slot."""
+    with Image.open(image_path) as img:
+        for i, target in zip(ImageSequence.Iterator(img), targets):
+            i = ImageOps.exif_transpose(i)
+
+            if i.mode == 'I':
+                i = i.point(lambda i: i * (1 / 255))
+            image = i.convert("RGB")
+
+            pixels = np.asarray(image)
+            if pixels.shape != target.shape:
+                raise ValueError(f"Unexpected frame size in {image_path}: {pixels.shape[1]}x{pixels.shape[0]}")
+            np.divide(pixels, 255.0, out=target, casting='unsafe')
+
+
 class LoadImagesFromSelectedFolder:
     @classmethod
     def INPUT_TYPES(cls):
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        comfyui_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
-        output_dir = os.path.join(comfyui_root, 'output')
-        
-        def count_images(folder_path):
-            # Count the number of image files in the folder
-            return len([f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))])
-        
-        folders = []
-        for root, dirs, files in os.walk(output_dir):
-            rel_path = os.path.relpath(root, output_dir)
-            if rel_path == '.':
-                continue
-            image_count = count_images(root)
-            if image_count > 0:
-                folder_name = f"{rel_path} ({image_count} images)"
-                folders.append((folder_name, rel_path))
-        
-        # Sort folders alphabetically, case-insensitive
-        folders.sort(key=lambda x: x[0].lower())
+        folders = list_image_folders(get_output_dir())
 
         return {
             "required": {
                 "selected_folder": ([folder[0] for folder in folders],),
+            },
+            "optional": {
+                # Paging for large folders: load max_images files starting at offset (0 = all)
+                "max_images": ("INT", {"default": 0, "min": 0, "max": 100000}),
+                "offset": ("INT", {"default": 0, "min": 0, "max": 10000000}),
+                "max_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             }
         }
-    
+
     RETURN_TYPES = ("IMAGE", "IMAGE", "IMAGE", "IMAGE")
     RETURN_NAMES = ("Images resolution 1", "Images resolution 2", "Images resolution 3", "Images resolution 4")
     FUNCTION = "load_images_from_selected_folder"
     CATEGORY = "Bjornulf"
 
-    def load_images_from_selected_folder(self, selected_folder):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        comfyui_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
-        output_dir = os.path.join(comfyui_root, 'output')
-        folder_path = os.path.join(output_dir, selected_folder.split(" (")[0])
-        
-        images_by_resolution = {}
+    def load_images_from_selected_folder(self, selected_folder, max_images=0, offset=0, max_workers=0):
+        folder_path = os.path.join(get_output_dir(), selected_folder.split(" (")[0])
 
         # Check if the folder exists and contains images
         if not os.path.exists(folder_path):
             print(f"Folder {folder_path} does not exist.")
             return (None, None, None)
 
-        image_files = [f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))]
+        image_files, _ = scan_folder(folder_path)
+        image_files = image_files[offset:offset + max_images] if max_images > 0 else image_files[offset:]
         if not image_files:
             print(f"No images found in folder {folder_path}.")
             return (None, None, None)
 
-        for image_file in image_files:
-            image_path = os.path.join(folder_path, image_file)
-            img = Image.open(image_path)
-            
-            for i in ImageSequence.Iterator(img):
-                i = ImageOps.exif_transpose(i)
-
-                if i.mode == 'I':
-                    i = i.point(lambda i: i * (1 / 255))
-                image = i.convert("RGB")
-                
-                resolution = image.size
-                
-                image = np.array(image).astype(np.float32) / 255.0
-                image = torch.from_numpy(image)[None,]
-                
-                if resolution not in images_by_resolution:
-                    images_by_resolution[resolution] = []
-                
-                images_by_resolution[resolution].append(image)
+        image_paths = [os.path.join(folder_path, image_file) for image_file in image_files]
+        workers = max_workers if max_workers > 0 else min(8, os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Headers first: frame count and size of every file, to allocate one tensor per resolution
+            frame_sizes = list(executor.map(image_frame_sizes, image_paths))
+
+            counts = {}
+            slots = []
+            for sizes in frame_sizes:
+                file_slots = []
+                for resolution in sizes:
+                    file_slots.append((resolution, counts.get(resolution, 0)))
+                    counts[resolution] = counts.get(resolution, 0) + 1
+                slots.append(file_slots)
+
+            images_by_resolution = {
+                resolution: torch.empty((count, resolution[1], resolution[0], 3), dtype=torch.float32)
+                for resolution, count in counts.items()
+            }
+            buffers = {resolution: images.numpy() for resolution, images in images_by_resolution.items()}
+
+            # Then decode in parallel, every frame written in place, in file order
+            def decode(args):
+                image_path, file_slots = args
+                decode_image_into(image_path, [buffers[resolution][index] for resolution, index in file_slots])
+
+            list(executor.map(decode, zip(image_paths, slots)))
 
         # Sort resolutions by total pixel count (width * height)
         sorted_resolutions = sorted(images_by_resolution.keys(), key=lambda r: r[0] * r[1], reverse=True)
@@ -86,12 +167,10 @@ class LoadImagesFromSelectedFolder:
         outputs = []
         for i in range(4):  # Return up to 4 different resolutions
             if i < len(sorted_resolutions):
-                resolution = sorted_resolutions[i]
-                output_image = torch.cat(images_by_resolution[resolution], dim=0)
-                outputs.append(output_image)
+                outputs.append(images_by_resolution[sorted_resolutions[i]])
             else:
                 # Create a placeholder tensor filled with 11111111111111111111111
-                H, W, C = 64, 64, 3 
+                H, W, C = 64, 64, 3
                 placeholder_image = torch.ones((1, H, W, C), dtype=torch.float32)
                 outputs.append(placeholder_image)
 
@@ -100,25 +179,9 @@ class LoadImagesFromSelectedFolder:
 # Define the API endpoint to get the list of image folders
 @PromptServer.instance.routes.get("/get_image_folders")
 async def get_image_folders(request):
-    # Get the ComfyUI output directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    comfyui_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
-    output_dir = os.path.join(comfyui_root, 'output')
-    
-    # Collect folders with images
-    folders = []
-    for root, dirs, files in os.walk(output_dir):
-        rel_path = os.path.relpath(root, output_dir)
-        if rel_path == '.':
-            continue  # Skip the root output directory itself
-        # Count image files in the folder
-        image_count = len([f for f in os.listdir(root) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))])
-        if image_count > 0:
-            folder_name = f"{rel_path} ({image_count} images)"
-            folders.append(folder_name)
-    
-    # Sort the list alphabetically (case-insensitive)
-    folders.sort(key=lambda x: x.lower())
-    
+    # Walk the output directory off the event loop, the UI stays responsive on large trees
+    loop = asyncio.get_running_loop()
+    folders = await loop.run_in_executor(None, list_image_folders, get_output_dir())
+
     # Return the folder list as JSON
-    return web.json_response({"success": True, "folders": folders})
\ No newline at end of file
+    return web.json_response({"success": True, "folders": [folder[0] for folder in folders]})
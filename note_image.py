@@ -8,6 +8,7 @@ import torch
 import folder_paths
 import node_helpers
 from aiohttp import web
+from .file_fingerprint import file_hash, cached_file_value
 
 class ImageNote:
     def __init__(self):
@@ -62,8 +63,10 @@ class ImageNote:
 
         # Case 1: Image provided via file path
         if image_path and os.path.isfile(image_path):
-            image = Image.open(image_path).convert("RGB")
-            image_hash = self.compute_md5(image)
+            # Same pixel md5 as before (notes are stored by it), the image is only decoded once per file version
+            image_hash = cached_file_value(
+                image_path, "image_md5", lambda: self.compute_md5(Image.open(image_path).convert("RGB"))
+            )
 
             # Determine image reference for UI
             if image_path.startswith(input_dir):
@@ -76,7 +79,7 @@ class ImageNote:
                 temp_filename = f"{image_hash}.png"
                 temp_path = os.path.join(temp_dir, temp_filename)
                 if not os.path.exists(temp_path):
-                    image.save(temp_path)
+                    Image.open(image_path).convert("RGB").save(temp_path)
                 type_ = "temp"
                 filename = temp_filename
 
@@ -201,7 +204,7 @@ class ImageNoteLoadImage:
 
         # Compute hash from the first image
         first_image = output_image[0] if output_image.dim() == 4 else output_image
-        image_hash = self.compute_md5(first_image)
+        image_hash = cached_file_value(image_path, "first_frame_md5", lambda: self.compute_md5(first_image))
 
         # Handle notes: append new notes and read all
         all_notes = [n for n in [note, note_2, note_3] if n]
@@ -220,10 +223,7 @@ class ImageNoteLoadImage:
     @classmethod
     def IS_CHANGED(s, image, note, note_2, note_3):
         image_path = folder_paths.get_annotated_filepath(image)
-        m = hashlib.sha256()
-        with open(image_path, 'rb') as f:
-            m.update(f.read())
-        return m.digest().hex() + str(note) + str(note_2) + str(note_3)
+        return file_hash(image_path) + str(note) + str(note_2) + str(note_3)
 
     @classmethod
     def VALIDATE_INPUTS(s, image):
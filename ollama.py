@@ -1,5 +1,7 @@
 import ollama
 from ollama import Client
+from .ollama_client_pool import get_ollama_pool, ollama_seed
+from .ollama_response_cache import response_cache_key, get_cached_response, store_response
 import logging
 import hashlib
 import os
@@ -84,6 +86,10 @@ class ollamaLoader:
                 }),
                 "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
                 "keep_1min_in_vram": ("BOOLEAN", {"default": False})
+            },
+            "optional": {
+                # Answer the same request (prompt, model, system prompt, seed) from the response cache
+                "use_cache": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -97,7 +103,15 @@ class ollamaLoader:
     #     # Update available models when the node is actually instantiated
     #     self.__class__._available_models = self.get_available_models()
 
-    def connect_2_ollama(self, user_prompt, selected_model, system_prompt, keep_1min_in_vram,ollama_url, seed):
+    def connect_2_ollama(self, user_prompt, selected_model, system_prompt, keep_1min_in_vram,ollama_url, seed, use_cache=False):
+        # The seed is sent to Ollama, a cached answer is the one the same request generates
+        options = {"seed": ollama_seed(seed)}
+        cache_key = response_cache_key(model=selected_model, system=system_prompt, prompt=user_prompt, options=options)
+        if use_cache:
+            cached = get_cached_response(cache_key)
+            if cached:
+                return (cached,)
+
         content_hash = hashlib.md5((user_prompt + selected_model + system_prompt).encode()).hexdigest()
 
         if content_hash != self.last_content_hash:
@@ -111,14 +125,17 @@ class ollamaLoader:
         
         def try_generate(host_url):
             try:
-                client = Client(host=host_url)
-                response = client.generate(
+                response = get_ollama_pool(host_url).request(
+                    "generate",
                     model=selected_model,
                     system=system_prompt,
                     prompt=user_prompt,
+                    options=options,
                     keep_alive=f"{keep_alive_minutes}m"
                 )
                 logging.info(f"Ollama response ({host_url}): {response['response']}")
+                if use_cache:
+                    store_response(cache_key, selected_model, response['response'])
                 return response['response']
             except Exception as e:
                 logging.error(f"Connection to {host_url} failed: {e}")
@@ -0,0 +1,154 @@
+import threading
+from contextlib import contextmanager
+import httpx
+from ollama import Client, AsyncClient
+
+# Ollama clients shared by every Ollama node, one per host and settings:
+# the HTTP connections stay open between executions, so a loop making hundreds of
+# short requests pays the TCP (and TLS) setup once instead of once per request.
+
+DEFAULT_OLLAMA_URL = "http://0.0.0.0:11434"
+# Seconds to wait for a response, 0 = no limit: loading a large model and generating a long answer can take many minutes
+DEFAULT_REQUEST_TIMEOUT = 0
+CONNECT_TIMEOUT = 10
+# Requests sent at once to the same host, the others wait for a free slot
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+# Idle connections kept open per host, and for how long (seconds)
+KEEPALIVE_CONNECTIONS = 8
+KEEPALIVE_EXPIRY = 300
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class OllamaHostPool:
+    """A kept-alive Client for one host, with at most max_concurrent requests in flight."""
+
+    def __init__(self, host, request_timeout=DEFAULT_REQUEST_TIMEOUT, max_concurrent=DEFAULT_MAX_CONCURRENT_REQUESTS):
+        self.host = host
+        self.request_timeout = request_timeout
+        self.max_concurrent = max_concurrent
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.retired = False
+        self.client = self.make_client()
+
+    def make_client(self):
+        return Client(
+            host=self.host,
+            timeout=httpx.Timeout(self.request_timeout or None, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=max(self.max_concurrent, KEEPALIVE_CONNECTIONS),
+                max_keepalive_connections=KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def acquire(self):
+        self.slots.acquire()
+        with self.lock:
+            if self.client is None:
+                # Used again after close_ollama_pools closed it (caller got the pool before)
+                self.client = self.make_client()
+            self.in_flight += 1
+            return self.client
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+            if self.retired and self.in_flight == 0:
+                self.close_client()
+        self.slots.release()
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the host's request slots, for requests whose response is read in several parts (streams)."""
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release()
+
+    def request(self, method, **kwargs):
+        """Call a Client method (generate, chat, list...) once a request slot is free."""
+        with self.slot() as client:
+            return getattr(client, method)(**kwargs)
+
+    def close_client(self):
+        if self.client is not None:
+            close_ollama_client(self.client)
+            self.client = None
+
+    def retire(self):
+        """Close the client now if it is idle, otherwise when its last request in flight ends."""
+        with self.lock:
+            self.retired = True
+            if self.in_flight == 0:
+                self.close_client()
+
+
+def close_ollama_client(client):
+    """Close the connections of a Client: its close() method, or its httpx client on older ollama versions without one."""
+    if hasattr(client, "close"):
+        client.close()
+    elif getattr(client, "_client", None) is not None:
+        client._client.close()
+
+
+async def aclose_ollama_client(client):
+    """close_ollama_client for an AsyncClient."""
+    if hasattr(client, "close"):
+        await client.close()
+    elif getattr(client, "_client", None) is not None:
+        await client._client.aclose()
+
+
+def ollama_seed(seed):
+    """Seed option for Ollama: ComfyUI seeds go up to 2**64 - 1, Ollama takes a signed 32 bit value."""
+    return seed % 2**31
+
+
+def get_ollama_pool(host=DEFAULT_OLLAMA_URL, request_timeout=DEFAULT_REQUEST_TIMEOUT,
+                    max_concurrent=DEFAULT_MAX_CONCURRENT_REQUESTS):
+    """
+    The shared pool of a host and its timeout / concurrency settings, created on first use.
+    Nodes with other settings get their own pool, so they never replace each other's connections.
+    """
+    host = (host or DEFAULT_OLLAMA_URL).strip().rstrip("/")
+    key = (host, request_timeout, max_concurrent)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = OllamaHostPool(host, request_timeout, max_concurrent)
+            _pools[key] = pool
+        return pool
+
+
+def get_config_pool(ollama_config):
+    """Shared pool for an OLLAMA_CONFIG, older configs without the timeout / concurrency keys get the defaults."""
+    return get_ollama_pool(
+        ollama_config["url"],
+        ollama_config.get("request_timeout", DEFAULT_REQUEST_TIMEOUT),
+        ollama_config.get("max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS),
+    )
+
+
+def async_ollama_client(host=DEFAULT_OLLAMA_URL, request_timeout=DEFAULT_REQUEST_TIMEOUT, max_connections=DEFAULT_MAX_CONCURRENT_REQUESTS):
+    """
+    AsyncClient with the same timeouts as the shared clients.
+    Its connections belong to the event loop that uses them, so it is not shared: one per batch.
+    """
+    return AsyncClient(
+        host=(host or DEFAULT_OLLAMA_URL).strip().rstrip("/"),
+        timeout=httpx.Timeout(request_timeout or None, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+def close_ollama_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.retire()
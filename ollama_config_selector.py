@@ -1,3 +1,5 @@
+from .ollama_client_pool import DEFAULT_REQUEST_TIMEOUT, DEFAULT_MAX_CONCURRENT_REQUESTS
+
 class OllamaConfig:
     @classmethod
     def INPUT_TYPES(cls):
@@ -5,6 +7,11 @@ class OllamaConfig:
             "required": {
                 "ollama_url": ("STRING", {"default": "http://0.0.0.0:11434"}),
                 "model_name": ("STRING", {"default": "undefined"})  # Empty list with no default
+            },
+            "optional": {
+                # Seconds to wait for an answer (0 = no limit), and requests sent at once to this server
+                "request_timeout": ("INT", {"default": DEFAULT_REQUEST_TIMEOUT, "min": 0, "max": 3600}),
+                "max_concurrent_requests": ("INT", {"default": DEFAULT_MAX_CONCURRENT_REQUESTS, "min": 1, "max": 64}),
             }
         }
 
@@ -13,9 +20,15 @@ class OllamaConfig:
     FUNCTION = "select_model"
     CATEGORY = "ollama"
 
-    def select_model(self, ollama_url, model_name):
-        return ({"model": model_name, "url": ollama_url},)
+    def select_model(self, ollama_url, model_name, request_timeout=DEFAULT_REQUEST_TIMEOUT,
+                     max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS):
+        return ({
+            "model": model_name,
+            "url": ollama_url,
+            "request_timeout": request_timeout,
+            "max_concurrent_requests": max_concurrent_requests,
+        },)
 
     @classmethod
-    def IS_CHANGED(cls, ollama_url, model_name) -> float:
+    def IS_CHANGED(cls, ollama_url, model_name, **kwargs) -> float:
         return 0.0
\ No newline at end of file
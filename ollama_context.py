@@ -0,0 +1,191 @@
+import os
+import glob
+import json
+import math
+import logging
+import threading
+
+# Conversation context of OllamaTalk as chat messages, trimmed to fit the context window.
+# The context file is a JSONL of {"role", "content", "tokens"} records, indexed by byte offset:
+# the token count of every message is known without reading the file again,
+# and only the messages that fit are read back.
+
+CONTEXT_DIR = os.path.join("Bjornulf", "ollama")
+CONTEXT_FILE = os.path.join(CONTEXT_DIR, "ollama_context.jsonl")
+# Plain text context file of older versions, imported once into the JSONL
+LEGACY_CONTEXT_FILE = os.path.join(CONTEXT_DIR, "ollama_context.txt")
+
+# Token estimate without a tokenizer: about 4 characters per token, plus the chat template of each message
+CHARS_PER_TOKEN = 4
+MESSAGE_TOKENS = 4
+# Part of num_ctx kept free for the answer
+RESPONSE_TOKENS_RATIO = 0.25
+
+ROLE_PREFIXES = {"User: ": "user", "Assistant: ": "assistant"}
+
+
+def estimate_tokens(text):
+    return MESSAGE_TOKENS + math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def history_budget(num_ctx, system_prompt, user_prompt):
+    """Tokens left for the history once the job, the new prompt and the answer have their room."""
+    return num_ctx - estimate_tokens(system_prompt) - estimate_tokens(user_prompt) - int(num_ctx * RESPONSE_TOKENS_RATIO)
+
+
+def parse_text_context(text):
+    """
+    Messages of a "User: ... / Assistant: ..." context string (the updated_context output).
+    Lines without a prefix continue the previous message, text before the first prefix is a user message.
+    """
+    messages = []
+    for line in (text or "").split("\n"):
+        role = next((role for prefix, role in ROLE_PREFIXES.items() if line.startswith(prefix)), None)
+        if role is not None:
+            messages.append({"role": role, "content": line.split(": ", 1)[1]})
+        elif messages:
+            messages[-1]["content"] += "\n" + line
+        elif line.strip():
+            messages.append({"role": "user", "content": line})
+    for message in messages:
+        message["content"] = message["content"].strip("\n")
+    return messages
+
+
+def format_text_context(messages):
+    return "\n".join(("User: " if message["role"] == "user" else "Assistant: ") + message["content"] for message in messages)
+
+
+def get_next_filename(base_path, base_name, extension="jsonl"):
+    """
+    Find the next available filename with format base_name.XXX.extension
+    where XXX is a 3-digit number starting from 001
+    """
+    pattern = os.path.join(base_path, f"{base_name}.[0-9][0-9][0-9].{extension}")
+    numbers = []
+    for f in glob.glob(pattern):
+        try:
+            numbers.append(int(f.split('.')[-2]))
+        except (ValueError, IndexError):
+            continue
+    next_number = max(numbers) + 1 if numbers else 1
+    return f"{base_name}.{next_number:03d}.{extension}"
+
+
+def fit_start(tokens, budget):
+    """Index of the oldest message kept: the newest messages whose tokens fit in budget."""
+    start = len(tokens)
+    used = 0
+    while start > 0 and used + tokens[start - 1] <= budget:
+        start -= 1
+        used += tokens[start]
+    return start
+
+
+def fit_messages(messages, budget):
+    """Newest messages that fit in budget tokens, the oldest turns are dropped."""
+    start = fit_start([estimate_tokens(message["content"]) for message in messages], budget)
+    kept = messages[start:]
+    # Don't start the history in the middle of a turn
+    while kept and kept[0]["role"] != "user":
+        kept = kept[1:]
+    if len(kept) < len(messages):
+        logging.info(f"[Ollama] Context trimmed to fit num_ctx: kept {len(kept)} of {len(messages)} messages")
+    return kept
+
+
+class ContextFile:
+    """The JSONL context file, with the byte offset and token count of every message kept in memory."""
+
+    def __init__(self, path=CONTEXT_FILE, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.lock = threading.Lock()
+        self.clear_index()
+
+    def clear_index(self):
+        self.offsets = []
+        self.tokens = []
+        self.roles = []
+        self.total_tokens = 0
+        self.indexed_size = 0
+        self.inode = None
+
+    def import_legacy_file(self):
+        """Convert the plain text context of older versions, then archive it as a reset would."""
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            messages = parse_text_context(f.read())
+        self.write_messages(messages)
+        directory = os.path.dirname(self.legacy_path)
+        base_name = os.path.splitext(os.path.basename(self.legacy_path))[0]
+        os.rename(self.legacy_path, os.path.join(directory, get_next_filename(directory, base_name, "txt")))
+        logging.info(f"[Ollama] Imported {len(messages)} messages from {self.legacy_path}")
+
+    def refresh(self):
+        """Index the records appended since the last call, start over if the file was replaced or removed."""
+        self.import_legacy_file()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.clear_index()
+            return
+        if stat.st_ino != self.inode or stat.st_size < self.indexed_size:
+            self.clear_index()
+            self.inode = stat.st_ino
+        if stat.st_size == self.indexed_size:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Record still being written
+                if line.strip():
+                    record = json.loads(line)
+                    self.offsets.append(offset)
+                    self.tokens.append(record.get("tokens") or estimate_tokens(record["content"]))
+                    self.total_tokens += self.tokens[-1]
+                    self.roles.append(record["role"])
+                offset += len(line)
+        self.indexed_size = offset
+
+    def write_messages(self, messages):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for message in messages:
+                record = {"role": message["role"], "content": message["content"], "tokens": estimate_tokens(message["content"])}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def append(self, messages):
+        with self.lock:
+            self.write_messages(messages)
+            self.refresh()
+
+    def size(self):
+        """(message count, estimated tokens) of the whole file."""
+        with self.lock:
+            self.refresh()
+            return len(self.tokens), self.total_tokens
+
+    def read_recent(self, budget):
+        """Newest messages that fit in budget tokens, only those records are read from the file."""
+        with self.lock:
+            self.refresh()
+            start = fit_start(self.tokens, budget)
+            while start < len(self.roles) and self.roles[start] != "user":
+                start += 1
+            if start == len(self.offsets):
+                return []
+            if start > 0:
+                logging.info(f"[Ollama] Context trimmed to fit num_ctx: kept {len(self.offsets) - start} of {len(self.offsets)} messages")
+            with open(self.path, "rb") as f:
+                f.seek(self.offsets[start])
+                data = f.read(self.indexed_size - self.offsets[start])
+        records = [json.loads(line) for line in data.splitlines() if line.strip()]
+        return [{"role": record["role"], "content": record["content"]} for record in records]
+
+
+context_file = ContextFile(CONTEXT_FILE, LEGACY_CONTEXT_FILE)
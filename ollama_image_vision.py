@@ -1,7 +1,10 @@
 import base64
+import hashlib
 import numpy as np
 from PIL import Image
 from io import BytesIO
+from .ollama_client_pool import get_config_pool, ollama_seed, DEFAULT_OLLAMA_URL
+from .ollama_response_cache import response_cache_key, get_cached_response, store_response
 
 class OllamaImageVision:
     @classmethod
@@ -25,6 +28,8 @@ class OllamaImageVision:
             "optional": {
                 "OLLAMA_CONFIG": ("OLLAMA_CONFIG", {"forceInput": True}),
                 "context": ("STRING", {"multiline": True}),
+                # Answer the same images + prompt + seed from the response cache (not with seed -1: random)
+                "use_cache": ("BOOLEAN", {"default": False}),
             }
         }
 
@@ -33,50 +38,63 @@ class OllamaImageVision:
     FUNCTION = "process_image"
     CATEGORY = "Bjornulf"
 
-    def process_image(self, IMAGE, OLLAMA_VISION_PROMPT, answer_single_line, vram_retention_minutes, seed, OLLAMA_CONFIG=None, context=None):
-        from ollama import Client
-        
+    def process_image(self, IMAGE, OLLAMA_VISION_PROMPT, answer_single_line, vram_retention_minutes, seed, OLLAMA_CONFIG=None, context=None, use_cache=False):
         # Default OLLAMA_CONFIG if not provided
         if OLLAMA_CONFIG is None:
             OLLAMA_CONFIG = {
                 "model": "moondream",
-                "url": "http://0.0.0.0:11434"
+                "url": DEFAULT_OLLAMA_URL
             }
         selected_model = OLLAMA_CONFIG["model"]
         ollama_url = OLLAMA_CONFIG["url"]
 
-        # Convert images to base64
-        images_base64 = []
-        for img in IMAGE:
-            numpy_img = (255. * img.cpu().numpy()).clip(0, 255).astype(np.uint8)
-            pil_image = Image.fromarray(numpy_img)
-            buffered = BytesIO()
-            pil_image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode('utf-8')
-            images_base64.append(img_str)
-            buffered.close()
-
-        # Initialize client
-        client = Client(host=ollama_url)
+        numpy_images = [(255. * img.cpu().numpy()).clip(0, 255).astype(np.uint8) for img in IMAGE]
 
         # Construct the final prompt
         if context:
             final_prompt = context + "\n" + OLLAMA_VISION_PROMPT
         else:
             final_prompt = OLLAMA_VISION_PROMPT
-        
-        # Generate response with the final prompt
-        response = client.generate(
-            model=selected_model,
-            prompt=final_prompt,
-            images=images_base64,
-            keep_alive=f"{vram_retention_minutes}m"
-        )
+
+        # The cache key hashes the pixels, the images are only encoded when the model is asked
+        images_hash = hashlib.sha256()
+        for numpy_img in numpy_images:
+            images_hash.update(str(numpy_img.shape).encode())
+            images_hash.update(numpy_img.tobytes())
+        # seed -1 is a random generation, nothing to cache
+        options = {"seed": ollama_seed(seed)} if seed >= 0 else {}
+        use_cache = use_cache and seed >= 0
+        cache_key = response_cache_key(model=selected_model, prompt=final_prompt, images=images_hash.hexdigest(), options=options)
+
+        result = get_cached_response(cache_key) if use_cache else None
+        if result is None:
+            # Convert images to base64
+            images_base64 = []
+            for numpy_img in numpy_images:
+                pil_image = Image.fromarray(numpy_img)
+                buffered = BytesIO()
+                pil_image.save(buffered, format="PNG")
+                img_str = base64.b64encode(buffered.getvalue()).decode('utf-8')
+                images_base64.append(img_str)
+                buffered.close()
+
+            # Generate response with the final prompt
+            response = get_config_pool(OLLAMA_CONFIG).request(
+                "generate",
+                model=selected_model,
+                prompt=final_prompt,
+                images=images_base64,
+                options=options,
+                keep_alive=f"{vram_retention_minutes}m"
+            )
+            result = response['response']
+            if use_cache:
+                store_response(cache_key, selected_model, result)
         
         if answer_single_line:
-            response['response'] = ' '.join(response['response'].split())
+            result = ' '.join(result.split())
         
-        return (response['response'].strip(),)
+        return (result.strip(),)
 
 class OllamaVisionPromptSelector: #Prompts made for gemma3
     @classmethod
@@ -0,0 +1,89 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+
+# Persistent cache of Ollama answers, shared by the Ollama nodes:
+# the same request (model, system prompt, prompt, options, seed, images...) is answered
+# from Bjornulf/ollama/ollama_response_cache.sqlite instead of running the model again.
+
+CACHE_PATH = os.path.join("Bjornulf", "ollama", "ollama_response_cache.sqlite")
+# Answers older than this are asked again (seconds)
+CACHE_TTL = 7 * 24 * 60 * 60
+# Least recently used answers are removed above this many entries
+CACHE_MAX_ENTRIES = 10000
+
+_connection = None
+_lock = threading.Lock()
+
+
+def get_connection():
+    global _connection
+    if _connection is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        _connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                created REAL,
+                last_used REAL
+            )
+        """)
+        _connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        _connection.commit()
+    return _connection
+
+
+def response_cache_key(**parts):
+    """sha256 of every part of a request that changes its answer, hashing long values (context, images) is fine."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_cached_response(key):
+    """Cached answer of a request, or None if it was never asked or has expired."""
+    now = time.time()
+    try:
+        with _lock:
+            connection = get_connection()
+            row = connection.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?", (key, now - CACHE_TTL)
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                connection.commit()
+    except sqlite3.Error as e:
+        print(f"Ollama response cache unavailable: {e}")
+        return None
+    return row[0] if row is not None else None
+
+
+def store_response(key, model, response):
+    """Save an answer, then drop expired and least recently used entries."""
+    now = time.time()
+    try:
+        with _lock:
+            connection = get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            connection.execute("DELETE FROM responses WHERE created < ?", (now - CACHE_TTL,))
+            connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (CACHE_MAX_ENTRIES,)
+            )
+            connection.commit()
+    except sqlite3.Error as e:
+        print(f"Ollama response cache unavailable: {e}")
+
+
+def clear_response_cache():
+    with _lock:
+        connection = get_connection()
+        connection.execute("DELETE FROM responses")
+        connection.commit()
@@ -10,10 +10,12 @@ from aiohttp import web
 import sys
 import os
 import time
-import glob
 import io
 import ollama
-from ollama import Client
+from .ollama_client_pool import get_config_pool, ollama_seed, DEFAULT_OLLAMA_URL
+from .ollama_response_cache import response_cache_key, get_cached_response, store_response
+from .ollama_context import (context_file, parse_text_context, format_text_context, fit_messages, history_budget,
+                             get_next_filename, CONTEXT_DIR, CONTEXT_FILE)
 
 class OllamaTalk:
     @classmethod
@@ -35,6 +37,18 @@ class OllamaTalk:
                 "OLLAMA_JOB": ("OLLAMA_JOB", {
                     "forceInput": True
                 }),
+                # Show the answer on the node while it is generated, and stop as soon as it is usable:
+                # at a stop sequence (one per line), after max_characters (0 = no limit),
+                # or at the end of the first line when answer_single_line is set
+                "stream": ("BOOLEAN", {"default": False}),
+                "stop_sequences": ("STRING", {"multiline": True, "default": ""}),
+                "max_characters": ("INT", {"default": 0, "min": 0, "max": 100000}),
+                # Answer the same request (prompt, context, job, model, seed...) from the response cache,
+                # the seed is sent to Ollama so a cached answer is the one the same request generates
+                "use_cache": ("BOOLEAN", {"default": False}),
+            },
+            "hidden": {
+                "unique_id": "UNIQUE_ID",
             }
         }
     
@@ -58,6 +72,12 @@ class OllamaTalk:
         self.ollama_response = ""
         self.widgets = {}
         self.use_context_file = False
+        self.stream = False
+        self.stop_sequences = []
+        self.max_characters = 0
+        self.node_id = None
+        self.seed = 0
+        self.use_cache = False
         OllamaTalk.current_instance = self
     
     def play_audio(self):
@@ -86,25 +106,11 @@ class OllamaTalk:
             return float("nan")
         return float(0)
 
-    def save_context(self, context):
-        os_path = os.path.join("Bjornulf", "ollama", "ollama_context.txt")
-        os.makedirs(os.path.dirname(os_path), exist_ok=True)
-        with open(os_path, "a", encoding="utf-8") as f:
-            f.write(context + "\n")
-            # f.write(context + "\n" + "-" * 80 + "\n")
-
-    def load_context(self):
-        os_path = os.path.join("Bjornulf", "ollama", "ollama_context.txt")
-        if os.path.exists(os_path):
-            with open(os_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
-        return ""
-
     def process_ollama_request(self, user_prompt, answer_single_line, max_tokens, use_context_file=False):
         if self.OLLAMA_CONFIG is None:
             self.OLLAMA_CONFIG = {
                 "model": "llama3.2:3b",
-                "url": "http://0.0.0.0:11434"
+                "url": DEFAULT_OLLAMA_URL
             }
         
         selected_model = self.OLLAMA_CONFIG["model"]
@@ -115,33 +121,44 @@ class OllamaTalk:
         else:
             OLLAMA_JOB_text = self.OLLAMA_JOB["prompt"]
 
-        formatted_prompt = "User: " + user_prompt
+        user_message = {"role": "user", "content": user_prompt}
         
+        # Only the newest turns that fit in num_ctx are sent, with room left for the answer
+        budget = history_budget(max_tokens, OLLAMA_JOB_text, user_prompt)
         if use_context_file:
-            file_context = self.load_context()
-            conversation = file_context + "\n" + formatted_prompt if file_context else formatted_prompt
+            history = context_file.read_recent(budget)
         else:
-            conversation = self.context + "\n" + formatted_prompt if self.context else formatted_prompt
+            history = fit_messages(parse_text_context(self.context), budget)
+        messages = [{"role": "system", "content": OLLAMA_JOB_text}] + history + [user_message]
         
         keep_alive_minutes = self.vram_retention_minutes
+        options = {"num_ctx": max_tokens, "seed": ollama_seed(self.seed)}
+        if self.stop_sequences:
+            options["stop"] = self.stop_sequences
+        
+        cache_key = response_cache_key(
+            model=selected_model, messages=messages, options=options,
+            stream=self.stream, max_characters=self.max_characters, answer_single_line=answer_single_line
+        )
         
         try:
-            client = Client(host=ollama_url)
-            response = client.generate(
-                model=selected_model,
-                system=OLLAMA_JOB_text,
-                prompt=conversation,
-                options={
-                    "num_ctx": max_tokens
-                },
-                keep_alive=f"{keep_alive_minutes}m"
-            )
-            result = response['response']
-            updated_context = conversation + "\nAssistant: " + result
-            self.context = updated_context
+            result = get_cached_response(cache_key) if self.use_cache else None
+            if result is not None:
+                if self.stream:
+                    self.send_stream_text(result, done=True, start=True)
+            else:
+                result = self.generate_answer(selected_model, messages, options,
+                                              f"{keep_alive_minutes}m", answer_single_line)
+                if self.use_cache:
+                    store_response(cache_key, selected_model, result)
+            turn = [user_message, {"role": "assistant", "content": result}]
             
             if use_context_file:
-                self.save_context(formatted_prompt + "\nAssistant: " + result)
+                context_file.append(turn)
+                updated_context = format_text_context(history + turn)
+            else:
+                updated_context = self.context + "\n" + format_text_context(turn) if self.context else format_text_context(turn)
+            self.context = updated_context
             
             if answer_single_line:
                 result = ' '.join(result.split())
@@ -152,9 +169,83 @@ class OllamaTalk:
             logging.error(f"Connection to {ollama_url} failed: {e}")
             return "Connection to Ollama failed.", self.context
 
+    def generate_answer(self, model, messages, options, keep_alive, answer_single_line):
+        pool = get_config_pool(self.OLLAMA_CONFIG)
+        if self.stream:
+            with pool.slot() as client:
+                chunks = client.chat(
+                    model=model,
+                    messages=messages,
+                    options=options,
+                    keep_alive=keep_alive,
+                    stream=True
+                )
+                return self.stream_response(chunks, answer_single_line)
+
+        response = pool.request(
+            "chat",
+            model=model,
+            messages=messages,
+            options=options,
+            keep_alive=keep_alive
+        )
+        result = response['message']['content']
+        if self.max_characters:
+            result = result[:self.max_characters]
+        return result
+
+    def find_stop(self, text, start, first_line_only):
+        """Index where the answer ends (stop sequence or end of the first line), searching from start, or None."""
+        stops = [text.find(stop, start) for stop in self.stop_sequences]
+        if first_line_only:
+            # Leading blank lines are not the end of the first line
+            content_start = len(text) - len(text.lstrip())
+            stops.append(text.find("\n", max(start, content_start)))
+        stops = [index for index in stops if index != -1]
+        return min(stops) if stops else None
+
+    def send_stream_text(self, text, done=False, start=False):
+        if self.node_id is not None:
+            PromptServer.instance.send_sync("bjornulf_ollama_stream", {
+                "node": self.node_id, "text": text, "done": done, "start": start
+            })
+
+    def stream_response(self, chunks, first_line_only=False):
+        """
+        Read a streamed chat response, forwarding the text to the node as it arrives.
+        The stream is closed at the first stop condition, which stops the generation on the server.
+        """
+        # The end of the text could be the beginning of a stop sequence, it is only sent once it can't be
+        holdback = max([len(stop) for stop in self.stop_sequences] + [1]) - 1
+        text = ""
+        sent = 0
+        self.send_stream_text("", start=True)
+        try:
+            for chunk in chunks:
+                previous_length = len(text)
+                text += chunk['message']['content']
+
+                stop = self.find_stop(text, max(0, previous_length - holdback), first_line_only)
+                if stop is not None:
+                    text = text[:stop]
+                if self.max_characters and len(text) >= self.max_characters:
+                    text = text[:self.max_characters]
+                    stop = len(text)
+                if stop is not None:
+                    break
+
+                if len(text) - holdback > sent:
+                    self.send_stream_text(text[sent:len(text) - holdback])
+                    sent = len(text) - holdback
+        finally:
+            chunks.close()
+        self.send_stream_text(text[sent:], done=True)
+        return text
+
     def chat_response(self, user_prompt, seed, vram_retention_minutes, waiting_for_prompt=False,
                      context="", OLLAMA_CONFIG=None, OLLAMA_JOB=None, answer_single_line=False,
-                     use_context_file=False, max_tokens=600, context_size=0):
+                     use_context_file=False, max_tokens=600, context_size=0,
+                     stream=False, stop_sequences="", max_characters=0, use_cache=False, unique_id=None):
         
         # Store configurations
         self.OLLAMA_CONFIG = OLLAMA_CONFIG
@@ -165,6 +256,12 @@ class OllamaTalk:
         self.user_prompt = user_prompt
         self.max_tokens = max_tokens
         self.use_context_file = use_context_file
+        self.stream = stream
+        self.stop_sequences = [line.rstrip("\r") for line in stop_sequences.split("\n") if line.strip()]
+        self.max_characters = max_characters
+        self.node_id = unique_id
+        self.seed = seed
+        self.use_cache = use_cache
 
         if waiting_for_prompt:
             self.play_audio()
@@ -213,23 +310,11 @@ async def resume_node(request):
 
 @PromptServer.instance.routes.post("/get_current_context_size")
 async def get_current_context_size(request):
-    counter_file = os.path.join("Bjornulf", "ollama", "ollama_context.txt")
     try:
-        if not os.path.exists(counter_file):
-            logging.info("[Ollama] Context file does not exist")
-            # Create parent directories if they don't exist
-            os.makedirs(os.path.dirname(counter_file), exist_ok=True)
-            # Create empty file
-            open(counter_file, 'w').close()
-            logging.info(f"[Ollama] Created empty context file at: {counter_file}")
-            return web.json_response({"success": True, "value": 0}, status=200)
-            
-        with open(counter_file, 'r', encoding='utf-8') as f:
-            # Count non-empty lines in the file
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-            line_count = len(lines)
-            logging.info(f"[Ollama] Found {line_count} lines in context file")
-            return web.json_response({"success": True, "value": line_count}, status=200)
+        # Only the records appended since the last call are read
+        message_count, tokens = context_file.size()
+        logging.info(f"[Ollama] Found {message_count} messages (~{tokens} tokens) in context file")
+        return web.json_response({"success": True, "value": message_count, "tokens": tokens}, status=200)
                 
     except Exception as e:
         # logging.error(f"Error reading context size: {str(e)}")
@@ -239,35 +324,12 @@ async def get_current_context_size(request):
             "value": 0
         }, status=500)
 
-def get_next_filename(base_path, base_name):
-    """
-    Find the next available filename with format base_name.XXX.txt
-    where XXX is a 3-digit number starting from 001
-    """
-    pattern = os.path.join(base_path, f"{base_name}.[0-9][0-9][0-9].txt")
-    existing_files = glob.glob(pattern)
-    
-    if not existing_files:
-        return f"{base_name}.001.txt"
-    
-    # Extract numbers from existing files and find the highest
-    numbers = []
-    for f in existing_files:
-        try:
-            num = int(f.split('.')[-2])
-            numbers.append(num)
-        except (ValueError, IndexError):
-            continue
-    
-    next_number = max(numbers) + 1 if numbers else 1
-    return f"{base_name}.{next_number:03d}.txt"
-
 @PromptServer.instance.routes.post("/reset_lines_context")
 def reset_lines_context(request):
     # logging.info("Reset lines counter called")
-    base_dir = os.path.join("Bjornulf", "ollama")
+    base_dir = CONTEXT_DIR
     base_file = "ollama_context"
-    counter_file = os.path.join(base_dir, f"{base_file}.txt")
+    counter_file = CONTEXT_FILE
     
     try:
         if os.path.exists(counter_file):
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from .ollama_client_pool import async_ollama_client, aclose_ollama_client, ollama_seed, DEFAULT_OLLAMA_URL, DEFAULT_REQUEST_TIMEOUT
+
+class OllamaTalkBatch:
+    """
+    Send a whole list of prompts to Ollama at once, instead of one node execution per prompt.
+    Answers are in the same order as the prompts, a failed prompt gives an empty answer and its error.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "user_prompts": ("STRING", {"forceInput": True}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "max_tokens": ("INT", {"default": 600, "min": 1, "max": 4096}),
+                "vram_retention_minutes": ("INT", {"default": 0, "min": 0, "max": 99}),
+                "answer_single_line": ("BOOLEAN", {"default": False}),
+                # Requests sent at once, set it to the OLLAMA_NUM_PARALLEL of the server
+                "parallel_requests": ("INT", {"default": 4, "min": 1, "max": 64}),
+            },
+            "optional": {
+                "OLLAMA_CONFIG": ("OLLAMA_CONFIG", {"forceInput": True}),
+                "OLLAMA_JOB": ("OLLAMA_JOB", {"forceInput": True}),
+            }
+        }
+
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ("STRING", "STRING", "INT")
+    RETURN_NAMES = ("ollama_responses", "errors", "failed_count")
+    OUTPUT_IS_LIST = (True, True, False)
+    FUNCTION = "batch_response"
+    CATEGORY = "Bjornulf"
+
+    async def generate_all(self, prompts, config, system_prompt, options, keep_alive, parallel_requests):
+        client = async_ollama_client(config["url"], config.get("request_timeout", DEFAULT_REQUEST_TIMEOUT), parallel_requests)
+        slots = asyncio.Semaphore(parallel_requests)
+
+        async def generate(prompt):
+            async with slots:
+                response = await client.generate(
+                    model=config["model"],
+                    system=system_prompt,
+                    prompt=prompt,
+                    options=options,
+                    keep_alive=keep_alive
+                )
+                return response['response']
+
+        try:
+            # gather keeps the order of the prompts, whatever order the answers arrive in
+            return await asyncio.gather(*[generate(prompt) for prompt in prompts], return_exceptions=True)
+        finally:
+            await aclose_ollama_client(client)
+
+    def batch_response(self, user_prompts, seed, max_tokens, vram_retention_minutes, answer_single_line,
+                       parallel_requests, OLLAMA_CONFIG=None, OLLAMA_JOB=None):
+        # With INPUT_IS_LIST every input is a list, the settings are their first value
+        max_tokens = max_tokens[0]
+        answer_single_line = answer_single_line[0]
+        parallel_requests = parallel_requests[0]
+        config = OLLAMA_CONFIG[0] if OLLAMA_CONFIG else {"model": "llama3.2:3b", "url": DEFAULT_OLLAMA_URL}
+        system_prompt = OLLAMA_JOB[0]["prompt"] if OLLAMA_JOB else "You are an helpful AI assistant."
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(self.generate_all(
+                user_prompts, config, system_prompt, {"num_ctx": max_tokens, "seed": ollama_seed(seed[0])},
+                f"{vram_retention_minutes[0]}m", parallel_requests
+            ))
+        finally:
+            loop.close()
+
+        responses, errors = [], []
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logging.error(f"Ollama request {i + 1}/{len(results)} to {config['url']} failed: {result}")
+                responses.append("")
+                errors.append(f"{type(result).__name__}: {result}")
+            else:
+                responses.append(' '.join(result.split()) if answer_single_line else result)
+                errors.append("")
+
+        failed_count = sum(1 for error in errors if error)
+        return (responses, errors, failed_count)
@@ -1,6 +1,4 @@
-import numpy as np
-import torch
-from PIL import Image
+from .image_resize import resize_images, RESIZE_METHODS
 
 class ResizeImage:
     @classmethod
@@ -11,6 +9,10 @@ class ResizeImage:
                 "width": ("INT", {"default": 256}),
                 "height": ("INT", {"default": 256}),
             },
+            "optional": {
+                "resize_method": (RESIZE_METHODS, {"default": "lanczos (PIL)"}),
+                "antialias": ("BOOLEAN", {"default": True}),
+            },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
 
@@ -19,15 +21,12 @@ class ResizeImage:
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def resize_image(self, image, width=256, height=256, prompt=None, extra_pnginfo=None):
-        # Ensure the input image is on CPU and convert to numpy array
-        image_np = image.cpu().numpy()
-        
+    def resize_image(self, image, width=256, height=256, resize_method="lanczos (PIL)", antialias=True, prompt=None, extra_pnginfo=None):
         # Get original dimensions
-        if image_np.ndim == 4:
-            orig_height, orig_width = image_np.shape[1:3]
+        if image.dim() == 4:
+            orig_height, orig_width = image.shape[1:3]
         else:
-            orig_height, orig_width = image_np.shape[:2]
+            orig_height, orig_width = image.shape[:2]
         
         # Calculate new dimensions maintaining aspect ratio if needed
         aspect_ratio = orig_width / orig_height
@@ -47,36 +46,8 @@ class ResizeImage:
             # Use provided dimensions
             new_width, new_height = width, height
 
-        # Check if the image is in the format [batch, height, width, channel]
-        if image_np.ndim == 4:
-            # If so, we'll process each image in the batch
-            resized_images = []
-            for img in image_np:
-                # Convert to PIL Image
-                pil_img = Image.fromarray((img * 255).astype(np.uint8))
-                # Resize
-                resized_pil = pil_img.resize((new_width, new_height), Image.LANCZOS)
-                # Convert back to numpy and normalize
-                resized_np = np.array(resized_pil).astype(np.float32) / 255.0
-                resized_images.append(resized_np)
-            
-            # Stack the resized images back into a batch
-            resized_batch = np.stack(resized_images)
-            # Convert to torch tensor
-            resized_tensor = torch.from_numpy(resized_batch)
-        else:
-            # If it's a single image, process it directly
-            # Convert to PIL Image
-            pil_img = Image.fromarray((image_np * 255).astype(np.uint8))
-            # Resize
-            resized_pil = pil_img.resize((new_width, new_height), Image.LANCZOS)
-            # Convert back to numpy and normalize
-            resized_np = np.array(resized_pil).astype(np.float32) / 255.0
-            # Add batch dimension if it was originally present
-            if image.dim() == 4:
-                resized_np = np.expand_dims(resized_np, axis=0)
-            # Convert to torch tensor
-            resized_tensor = torch.from_numpy(resized_np)
+        # Whole batch at once: one interpolate call, or PIL LANCZOS frames in a thread pool
+        resized_tensor = resize_images(image, new_width, new_height, resize_method, antialias)
 
         # Update metadata if needed
         if extra_pnginfo is not None:
@@ -1,6 +1,4 @@
-import numpy as np
-import torch
-from PIL import Image
+from .image_resize import resize_images, RESIZE_METHODS
 
 class ResizeImagePercentage:
     @classmethod
@@ -15,6 +13,10 @@ class ResizeImagePercentage:
                     "step": 1,
                 }),
             },
+            "optional": {
+                "resize_method": (RESIZE_METHODS, {"default": "lanczos (PIL)"}),
+                "antialias": ("BOOLEAN", {"default": True}),
+            },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
 
@@ -24,61 +26,19 @@ class ResizeImagePercentage:
     OUTPUT_NODE = True
     CATEGORY = "Bjornulf"
 
-    def resize_image(self, image, percentage=100.0, prompt=None, extra_pnginfo=None):
+    def resize_image(self, image, percentage=100.0, resize_method="lanczos (PIL)", antialias=True, prompt=None, extra_pnginfo=None):
         # Convert percentage to decimal (e.g., 150% -> 1.5)
         scale_factor = percentage / 100.0
         
-        # Ensure the input image is on CPU and convert to numpy array
-        image_np = image.cpu().numpy()
-        
-        # Initialize new_width and new_height
-        new_width = 0
-        new_height = 0
-        
-        # Check if the image is in the format [batch, height, width, channel]
-        if image_np.ndim == 4:
-            # Process each image in the batch
-            resized_images = []
-            for img in image_np:
-                # Get original dimensions
-                orig_height, orig_width = img.shape[:2]
-                
-                # Calculate new dimensions
-                new_width = int(orig_width * scale_factor)
-                new_height = int(orig_height * scale_factor)
-                
-                # Convert to PIL Image
-                pil_img = Image.fromarray((img * 255).astype(np.uint8))
-                # Resize
-                resized_pil = pil_img.resize((new_width, new_height), Image.LANCZOS)
-                # Convert back to numpy and normalize
-                resized_np = np.array(resized_pil).astype(np.float32) / 255.0
-                resized_images.append(resized_np)
-            
-            # Stack the resized images back into a batch
-            resized_batch = np.stack(resized_images)
-            # Convert to torch tensor
-            resized_tensor = torch.from_numpy(resized_batch)
-        else:
-            # If it's a single image, process it directly
-            # Get original dimensions
-            orig_height, orig_width = image_np.shape[:2]
-            
-            # Calculate new dimensions
-            new_width = int(orig_width * scale_factor)
-            new_height = int(orig_height * scale_factor)
-            
-            # Convert to PIL Image
-            pil_img = Image.fromarray((image_np * 255).astype(np.uint8))
-            # Resize
-            resized_pil = pil_img.resize((new_width, new_height), Image.LANCZOS)
-            # Convert back to numpy and normalize
-            resized_np = np.array(resized_pil).astype(np.float32) / 255.0
-            # Add batch dimension if it was originally present
-            if image.dim() == 4:
-                resized_np = np.expand_dims(resized_np, axis=0)
-            # Convert to torch tensor
-            resized_tensor = torch.from_numpy(resized_np)
+        # Get original dimensions
+        orig_height, orig_width = image.shape[-3:-1]
+
+        # Calculate new dimensions
+        new_width = int(orig_width * scale_factor)
+        new_height = int(orig_height * scale_factor)
+
+        # Whole batch at once: one interpolate call, or PIL LANCZOS frames in a thread pool
+        resized_tensor = resize_images(image, new_width, new_height, resize_method, antialias)
 
         # Update metadata if needed
         if extra_pnginfo is not None:
@@ -203,4 +203,133 @@ class ReassembleImageGrid:
                 w_end = w_start + part_width
                 reassembled[:, h_start:h_end, w_start:w_end, :] = cropped_part
 
-        return (reassembled,)
\ No newline at end of file
+        return (reassembled,)
+
+def tile_layout(size, count, overlap):
+    """Tile size and stride so that count tiles overlapping by overlap pixels cover size."""
+    tile = -(-(size + (count - 1) * overlap) // count)
+    if count > 1 and overlap >= tile:
+        raise ValueError(f"Overlap of {overlap}px is too large for {count} tiles over {size}px")
+    stride = tile - overlap
+    return tile, stride
+
+
+def feather_weights(size, overlap, feather=True):
+    """1D blend weights of a tile: linear ramps over the overlap at both ends, never 0."""
+    weights = torch.ones(size)
+    overlap = min(overlap, size // 2)
+    if feather and overlap > 0:
+        ramp = torch.arange(1, overlap + 1, dtype=torch.float32) / (overlap + 1)
+        weights[:overlap] = ramp
+        weights[-overlap:] = ramp.flip(0)
+    return weights
+
+
+class SplitImageTiles:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "rows": ("INT", {"default": 2, "min": 1, "max": 64}),
+                "columns": ("INT", {"default": 2, "min": 1, "max": 64}),
+                "overlap": ("INT", {"default": 32, "min": 0, "max": 1024}),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "INT", "INT", "INT")
+    RETURN_NAMES = ("tiles", "rows", "columns", "overlap")
+    FUNCTION = "split"
+    CATEGORY = "image"
+
+    def split(self, image, rows, columns, overlap):
+        """
+        Split every frame into rows x columns overlapping tiles, returned as one batch
+        ordered frame by frame, then row by row: index = (frame * rows + row) * columns + column.
+        """
+        B, H, W, C = image.shape
+        tile_height, stride_height = tile_layout(H, rows, overlap)
+        tile_width, stride_width = tile_layout(W, columns, overlap)
+
+        x = image.movedim(-1, 1)
+        # Last tiles may reach past the image: extend the edges instead of leaving black borders
+        pad_bottom = (rows - 1) * stride_height + tile_height - H
+        pad_right = (columns - 1) * stride_width + tile_width - W
+        if pad_bottom > 0 or pad_right > 0:
+            x = torch.nn.functional.pad(x, (0, pad_right, 0, pad_bottom), mode="replicate")
+
+        # Strided views of the tiles, no copy: (B, C, rows, columns, tile_height, tile_width)
+        tiles = x.unfold(2, tile_height, stride_height).unfold(3, tile_width, stride_width)
+        # One copy into a batch of tiles for the sampler: (B * rows * columns, tile_height, tile_width, C)
+        tiles = tiles.permute(0, 2, 3, 4, 5, 1).reshape(B * rows * columns, tile_height, tile_width, C)
+
+        return (tiles, rows, columns, overlap)
+
+
+class ReassembleImageTiles:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "tiles": ("IMAGE",),
+                "original": ("IMAGE",),
+                "rows": ("INT", {"default": 2, "min": 1, "max": 64}),
+                "columns": ("INT", {"default": 2, "min": 1, "max": 64}),
+                "overlap": ("INT", {"default": 32, "min": 0, "max": 1024}),
+            },
+            "optional": {
+                "feather": ("BOOLEAN", {"default": True}),
+            }
+        }
+
+    RETURN_TYPES = ["IMAGE"]
+    RETURN_NAMES = ["image"]
+    FUNCTION = "reassemble"
+    CATEGORY = "image"
+
+    def reassemble(self, tiles, original, rows, columns, overlap, feather=True):
+        """
+        Fold the tiles of SplitImageTiles back into full frames in one op, blending the overlaps.
+
+        Tiles may have been upscaled (e.g. tiled upscale): the output is scaled by the same factor.
+        """
+        _, H, W, _ = original.shape
+        tile_count = rows * columns
+        if tiles.shape[0] % tile_count != 0:
+            raise ValueError(f"Got {tiles.shape[0]} tiles, expected a multiple of {rows}x{columns} = {tile_count}")
+        B = tiles.shape[0] // tile_count
+        _, tile_height, tile_width, C = tiles.shape
+
+        # Scale factor between the processed tiles and the tiles SplitImageTiles made
+        source_tile_height, source_stride_height = tile_layout(H, rows, overlap)
+        source_tile_width, source_stride_width = tile_layout(W, columns, overlap)
+        scale_height = tile_height / source_tile_height
+        scale_width = tile_width / source_tile_width
+        stride_height = round(source_stride_height * scale_height)
+        stride_width = round(source_stride_width * scale_width)
+        padded_height = (rows - 1) * stride_height + tile_height
+        padded_width = (columns - 1) * stride_width + tile_width
+
+        window = torch.outer(
+            feather_weights(tile_height, tile_height - stride_height if rows > 1 else 0, feather),
+            feather_weights(tile_width, tile_width - stride_width if columns > 1 else 0, feather),
+        ).to(tiles.device, tiles.dtype)
+
+        # (B * L, h, w, C) -> (B, C * h * w, L), each tile weighted by the blend window
+        patches = (tiles.view(B, tile_count, tile_height, tile_width, C) * window[None, None, :, :, None])
+        patches = patches.permute(0, 4, 2, 3, 1).reshape(B, C * tile_height * tile_width, tile_count)
+
+        fold_args = {
+            "output_size": (padded_height, padded_width),
+            "kernel_size": (tile_height, tile_width),
+            "stride": (stride_height, stride_width),
+        }
+        image = torch.nn.functional.fold(patches, **fold_args)
+        weights = torch.nn.functional.fold(
+            window.reshape(1, tile_height * tile_width, 1).expand(1, -1, tile_count), **fold_args
+        )
+        image = image / weights
+
+        out_height = min(round(H * scale_height), padded_height)
+        out_width = min(round(W * scale_width), padded_width)
+        return (image[:, :, :out_height, :out_width].movedim(1, -1).contiguous(),)
@@ -0,0 +1,70 @@
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is required")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "bjornulf_nodes"
+
+
+def load_module(name):
+    # The repo root is a ComfyUI package whose __init__ imports every node: only load the modules under test
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [REPO_ROOT]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+def ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-v", "error", "-y", *args], check=True)
+
+
+@pytest.fixture
+def clips(tmp_path):
+    """A lossless 64x32 clip, and the same stream remuxed with a 90 degree display rotation."""
+    source = str(tmp_path / "source.mp4")
+    rotated = str(tmp_path / "rotated.mp4")
+    ffmpeg("-f", "lavfi", "-i", "testsrc=size=64x32:rate=10", "-frames:v", "3",
+           "-c:v", "libx264", "-pix_fmt", "yuv444p", "-qp", "0", source)
+    ffmpeg("-display_rotation", "90", "-i", source, "-c", "copy", rotated)
+    return source, rotated
+
+
+def probe_stub(ffmpeg_probe, rotations):
+    """probe() without ffprobe: the stored size of the test clips, with the rotation of each file."""
+    def probe(path, ffprobe_path="ffprobe"):
+        return ffmpeg_probe.ProbeResult(path=path, width=64, height=32, fps=10.0, frame_count=3,
+                                        has_video=True, rotation=rotations.get(path, 0))
+    return probe
+
+
+def test_stream_rotation_from_display_matrix_and_tag():
+    ffmpeg_probe = load_module("ffmpeg_probe")
+    assert ffmpeg_probe.stream_rotation({"side_data_list": [{"side_data_type": "Display Matrix", "rotation": -90}]}) == -90
+    assert ffmpeg_probe.stream_rotation({"tags": {"rotate": "270"}}) == 270
+    assert ffmpeg_probe.stream_rotation({}) == 0
+
+
+@pytest.mark.parametrize("rotation", [90, -90, 270])
+def test_read_video_frames_rotated_clip(clips, monkeypatch, rotation):
+    frame_reader = load_module("frame_reader")
+    source, rotated = clips
+    monkeypatch.setattr(frame_reader, "probe", probe_stub(load_module("ffmpeg_probe"), {rotated: rotation}))
+
+    frames = frame_reader.read_video_frames(source)
+    rotated_frames = frame_reader.read_video_frames(rotated)
+
+    assert frames.shape == (3, 32, 64, 3)
+    # ffmpeg autorotates the clip (the stub rotation only sizes the frames): upright 32x64 frames, not a scrambled 64x32 split
+    assert rotated_frames.shape == (3, 64, 32, 3)
+    assert torch.equal(rotated_frames, torch.from_numpy(np.ascontiguousarray(np.rot90(frames.numpy(), k=1, axes=(1, 2)))))
@@ -2,7 +2,7 @@ import subprocess
 import json
 from pathlib import Path
 import os
-import re
+from .ffmpeg_probe import probe
 try:
     import ffmpeg
     FFMPEG_PYTHON_AVAILABLE = True
@@ -29,16 +29,6 @@ class VideoDetails:
     FUNCTION = "get_video_info"
     CATEGORY = "Bjornulf"
 
-    def extract_bitrate(self, text):
-        """Extract bitrate value from text."""
-        match = re.search(r'(\d+(?:\.\d+)?)\s*(?:kb/s|Kb/s|KB/s|Mb/s|MB/s)', text)
-        if match:
-            value = float(match.group(1))
-            if 'mb/s' in text.lower() or 'MB/s' in text:
-                value *= 1000
-            return f"{value:.0f}k"
-        return "N/A"
-
     def create_json_output(self, filename, video_path, width, height, fps, total_frames,
                          duration_seconds, duration_seconds_float, video_codec,
                          video_bitrate, pixel_format, audio_codec, audio_bitrate,
@@ -203,83 +193,23 @@ Container Format: {container_format}
         if use_python_ffmpeg:
             return self.get_video_info_python_ffmpeg(video_path)
 
-        # Original ffmpeg/ffprobe implementation
-        probe_cmd = [
-            ffprobe_path,
-            '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format',
-            '-show_streams',
-            video_path
-        ]
-
-        info_cmd = [
-            ffprobe_path,
-            '-i', video_path,
-            '-hide_banner'
-        ]
-
+        # Single cached ffprobe call (shared with the other video nodes)
         try:
-            probe_result = subprocess.run(probe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            probe_data = json.loads(probe_result.stdout)
-            
-            info_result = subprocess.run(info_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            ffmpeg_output = info_result.stderr
-
-            # Initialize variables with default values
-            width = 0
-            height = 0
-            fps = 0.0
-            total_frames = 0
-            duration_seconds = 0
-            duration_seconds_float = 0.0
-            video_codec = "N/A"
-            video_bitrate = "N/A"
-            pixel_format = "N/A"
-            audio_codec = "N/A"
-            audio_bitrate = "N/A"
-            container_format = "N/A"
-
-            # Extract information from probe data
-            if 'format' in probe_data:
-                format_data = probe_data['format']
-                # container_format = format_data.get('format_name', "N/A").split(',')[0]
-                container_format = format_data.get('format_name', "N/A").split(',')[0]
-                # With:
-                format_name = format_data.get('format_name', "N/A")
-                if 'mp4' in format_name.lower():
-                    container_format = 'mp4'
-                else:
-                    container_format = format_name.split(',')[0]
-                duration_seconds_float = float(format_data.get('duration', 0))
-                duration_seconds = int(duration_seconds_float)
+            info = probe(video_path, ffprobe_path)
 
-            # Process streams
-            for stream in probe_data.get('streams', []):
-                if stream['codec_type'] == 'video':
-                    width = int(stream.get('width', 0))
-                    height = int(stream.get('height', 0))
-                    
-                    fps_str = stream.get('r_frame_rate', '')
-                    if fps_str and fps_str != '0/0':
-                        num, den = map(int, fps_str.split('/'))
-                        fps = num / den if den != 0 else 0.0
-                    
-                    total_frames = int(stream.get('nb_frames', 0))
-                    if total_frames == 0 and fps > 0 and duration_seconds_float > 0:
-                        total_frames = int(duration_seconds_float * fps)
-                    
-                    video_codec = stream.get('codec_name', "N/A")
-                    pixel_format = stream.get('pix_fmt', "N/A")
-                    
-                elif stream['codec_type'] == 'audio':
-                    audio_codec = stream.get('codec_name', "N/A")
-                    audio_bitrate = stream.get('bit_rate', "N/A")
-                    if audio_bitrate != "N/A":
-                        audio_bitrate = f"{int(int(audio_bitrate)/1000)}k"
-
-            # Extract video bitrate from ffmpeg output
-            video_bitrate = self.extract_bitrate(ffmpeg_output)
+            width = info.width
+            height = info.height
+            fps = info.fps
+            total_frames = info.frame_count
+            duration_seconds_float = info.duration
+            duration_seconds = int(duration_seconds_float)
+            video_codec = info.video_codec
+            pixel_format = info.pixel_format
+            audio_codec = info.audio_codec
+            audio_bitrate = f"{int(info.audio_bit_rate/1000)}k" if info.audio_bit_rate else "N/A"
+            container_format = info.container_format
+            # Overall bitrate, as reported on the "Duration: ..., bitrate: N kb/s" line of ffmpeg -i
+            video_bitrate = f"{info.bit_rate/1000:.0f}k" if info.bit_rate else "N/A"
 
             filename = os.path.basename(video_path)
 
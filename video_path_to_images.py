@@ -1,8 +1,7 @@
 import os
+import math
 import cv2
-import numpy as np
 import torch
-from PIL import Image
 
 class VideoToImagesList:
     @classmethod
@@ -12,51 +11,96 @@ class VideoToImagesList:
                 "video_path": ("STRING", {"forceInput": True}),
                 "frame_interval": ("INT", {"default": 1, "min": 1, "max": 100}),
                 "max_frames": ("INT", {"default": 0, "min": 0, "max": 10000})
+            },
+            "optional": {
+                "start_time": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 86400.0, "step": 0.01}),
+                "end_time": ("FLOAT", {"default": 0.0, "min": 0.0, "max": 86400.0, "step": 0.01}),
             }
         }
-    
+
     RETURN_TYPES = ("IMAGE", "FLOAT", "FLOAT", "INT")
     RETURN_NAMES = ("IMAGE", "initial_fps", "new_fps", "total_frames")
     FUNCTION = "video_to_images"
     CATEGORY = "Bjornulf"
 
-    def video_to_images(self, video_path, frame_interval=1, max_frames=0):
+    # Number of frames added each time the output tensor has to grow (unknown or wrong frame count)
+    GROW_BLOCK = 64
+
+    def video_to_images(self, video_path, frame_interval=1, max_frames=0, start_time=0.0, end_time=0.0):
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
-        
+
         cap = cv2.VideoCapture(video_path)
-        frame_count = 0
-        images = []
-        
+
         # Get the initial fps of the video
         initial_fps = cap.get(cv2.CAP_PROP_FPS)
-        
+
         # Get the total number of frames in the video
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        while True:
+
+        # Seek to start_time instead of decoding everything before it
+        start_frame = 0
+        if start_time > 0 and initial_fps > 0:
+            start_frame = int(round(start_time * initial_fps))
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+        # Without end_time, read until the decoder runs out of frames:
+        # the container frame count is only an estimate (often too low for webm / VFR)
+        end_frame = None
+        if end_time > 0 and initial_fps > 0:
+            end_frame = int(round(end_time * initial_fps))
+            if end_frame <= start_frame:
+                cap.release()
+                raise ValueError(f"end_time ({end_time}) must be greater than start_time ({start_time})")
+
+        # Expected number of output frames, only used to preallocate the output tensor
+        expected = self.GROW_BLOCK
+        last_frame = end_frame if end_frame is not None else total_frames
+        if last_frame > start_frame:
+            expected = math.ceil((last_frame - start_frame) / frame_interval)
+        if end_frame is not None and total_frames > 0:
+            expected = min(expected, max(1, math.ceil((total_frames - start_frame) / frame_interval)))
+        if max_frames > 0:
+            expected = min(expected, max_frames)
+
+        images = None
+        count = 0
+        frame_index = start_frame
+
+        while end_frame is None or frame_index < end_frame:
+            if max_frames > 0 and count >= max_frames:
+                break
+
+            if (frame_index - start_frame) % frame_interval != 0:
+                # Skipped frame: advance without decoding it
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+
             ret, frame = cap.read()
-            if not ret or (max_frames > 0 and len(images) >= max_frames):
+            if not ret:
                 break
-            
-            if frame_count % frame_interval == 0:
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(rgb_frame)
-                
-                # Convert PIL Image to tensor
-                tensor_image = torch.from_numpy(np.array(pil_image).astype(np.float32) / 255.0).unsqueeze(0)
-                images.append(tensor_image)
-            
-            frame_count += 1
-        
+
+            if images is None:
+                height, width = frame.shape[:2]
+                images = torch.empty((max(expected, 1), height, width, 3), dtype=torch.float32)
+            elif count >= images.shape[0]:
+                # Frame count from the container was too low: grow by a block, keeping decoded frames
+                images.resize_((images.shape[0] + self.GROW_BLOCK, *images.shape[1:]))
+
+            # Convert BGR to RGB and uint8 to float directly into the preallocated slot
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+            images[count].copy_(torch.from_numpy(frame)).div_(255.0)
+            count += 1
+            frame_index += 1
+
         cap.release()
-        
-        if not images:
+
+        if count == 0:
             raise ValueError("No frames were extracted from the video")
-        
+
         # Calculate the new fps
         new_fps = initial_fps / frame_interval
-        
-        # Stack all images into a single tensor
-        return (torch.cat(images, dim=0), initial_fps, new_fps, total_frames)
+
+        return (images[:count], initial_fps, new_fps, total_frames)
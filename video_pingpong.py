@@ -1,10 +1,8 @@
 import torch
 import os
-import shutil
-from PIL import Image
 import numpy as np
-import glob
-import subprocess
+from .frame_reader import read_video_frames
+from .ffmpeg_probe import probe
 
 class VideoPingPong:
     @classmethod
@@ -22,75 +20,56 @@ class VideoPingPong:
     FUNCTION = "pingpong_images"
     CATEGORY = "Bjornulf"
 
-    def extract_frames(self, video_path, temp_dir, use_python_ffmpeg):
-        """Extract frames from a video file using FFmpeg, preserving original settings."""
+    def pingpong_indices(self, num_frames, device=None):
+        """Forward frames then the reverse half without repeating both ends: 0..n-1, n-2..1"""
+        return torch.cat([
+            torch.arange(num_frames, device=device),
+            torch.arange(max(num_frames - 2, 0), 0, -1, device=device),
+        ])
+
+    def extract_frames(self, video_path, use_python_ffmpeg):
+        """Decode all frames of a video file once, in memory, as a uint8 tensor (B, H, W, 3)."""
         if use_python_ffmpeg:
             try:
                 import ffmpeg
-                (
+            except ImportError:
+                raise RuntimeError("ffmpeg-python is not installed. Please install it or set use_python_ffmpeg to False.")
+            try:
+                info = probe(video_path)
+                out, _ = (
                     ffmpeg
                     .input(video_path)
-                    .output(os.path.join(temp_dir, 'frame_%04d.png'), start_number=0)
-                    .run()
+                    .output('pipe:', format='rawvideo', pix_fmt='rgb24')
+                    .run(capture_stdout=True)
                 )
-            except ImportError:
-                raise RuntimeError("ffmpeg-python is not installed. Please install it or set use_python_ffmpeg to False.")
             except ffmpeg.Error as e:
                 raise RuntimeError(f"Failed to extract frames using ffmpeg-python: {e}")
-        else:
-            ffmpeg_cmd = ['ffmpeg', '-i', video_path, '-start_number', '0', os.path.join(temp_dir, 'frame_%04d.png')]
-            try:
-                subprocess.run(ffmpeg_cmd, check=True)
-            except subprocess.CalledProcessError as e:
-                raise RuntimeError(f"Failed to extract frames using FFmpeg: {e}")
-
-    def pingpong_images(self, images=None, video_path="", use_python_ffmpeg=False):
-        """Generate a ping-pong sequence from images or a video file, prioritizing images if provided."""
-        temp_dir = "temp_pingpong"
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        os.makedirs(temp_dir)
+            frames = np.frombuffer(out, dtype=np.uint8).reshape(-1, info.height, info.width, 3)
+            return torch.from_numpy(frames.copy())
 
         try:
-            if images is not None:
-                num_frames = images.shape[0]
-                for i in range(num_frames):
-                    img_tensor = images[i]
-                    img_pil = Image.fromarray((img_tensor.cpu().numpy() * 255).astype('uint8'))
-                    img_path = os.path.join(temp_dir, f"frame_{i:04d}.png")
-                    img_pil.save(img_path)
-            elif video_path and os.path.exists(video_path):
-                self.extract_frames(video_path, temp_dir, use_python_ffmpeg)
-            else:
-                raise ValueError("Either images or a valid video_path must be provided")
-
-            frame_files = sorted(glob.glob(os.path.join(temp_dir, "frame_*.png")))
-            num_frames = len(frame_files)
-            if num_frames == 0:
-                raise RuntimeError("No frames available to process")
+            return read_video_frames(video_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to extract frames using FFmpeg: {e}")
 
-            pingpong_list = list(range(num_frames)) + list(range(num_frames - 2, 0, -1))
+    def pingpong_images(self, images=None, video_path="", use_python_ffmpeg=False):
+        """Generate a ping-pong sequence from images or a video file, prioritizing images if provided."""
+        if images is not None:
+            frames = images
+        elif video_path and os.path.exists(video_path):
+            frames = self.extract_frames(video_path, use_python_ffmpeg)
+        else:
+            raise ValueError("Either images or a valid video_path must be provided")
 
-            batch_size = 10
-            pingpong_tensors = []
-            for i in range(0, len(pingpong_list), batch_size):
-                batch = pingpong_list[i:i + batch_size]
-                batch_tensors = []
-                for j in batch:
-                    img_path = os.path.join(temp_dir, f"frame_{j:04d}.png")
-                    img_pil = Image.open(img_path)
-                    img_np = np.array(img_pil).astype(np.float32) / 255.0
-                    img_tensor = torch.from_numpy(img_np)
-                    batch_tensors.append(img_tensor)
-                    img_pil.close()
-                batch_tensor = torch.stack(batch_tensors)
-                pingpong_tensors.append(batch_tensor)
-                del batch_tensors
-                torch.cuda.empty_cache()
+        num_frames = frames.shape[0]
+        if num_frames == 0:
+            raise RuntimeError("No frames available to process")
 
-            pingpong_tensor = torch.cat(pingpong_tensors, dim=0)
+        # The ping-pong sequence is only an index gather over the frames
+        pingpong_tensor = frames[self.pingpong_indices(num_frames, frames.device)]
 
-        finally:
-            shutil.rmtree(temp_dir)
+        if pingpong_tensor.dtype == torch.uint8:
+            # Decoded video: gather on uint8 first, then convert once
+            pingpong_tensor = pingpong_tensor.float().div_(255.0)
 
-        return (pingpong_tensor,)
\ No newline at end of file
+        return (pingpong_tensor,)
@@ -4,9 +4,8 @@ import time
 import hashlib
 from pathlib import Path
 import subprocess
-import numpy as np
-import cv2
 import tempfile
+from .frame_writer import write_frames, FRAME_FORMATS
 
 # Supported extensions for video inputs
 SUPPORTED_VIDEO_EXTENSIONS = {'.mp4', '.webm', '.ogg', '.mov', '.mkv'}
@@ -24,6 +23,9 @@ class VideoPreview:
             "optional": {
                 "video_path": ("STRING", {"forceInput": True, "default": ""}),
                 "IMAGES": ("IMAGE", {"default": None}),
+                "frame_format": (FRAME_FORMATS, {"default": "png"}),
+                "png_compress_level": ("INT", {"default": 1, "min": 0, "max": 9}),
+                "frame_workers": ("INT", {"default": 0, "min": 0, "max": 64}),
             }
         }
 
@@ -32,7 +34,8 @@ class VideoPreview:
     CATEGORY = "Bjornulf"
     OUTPUT_NODE = True
 
-    def preview_video(self, fps_for_IMAGES, autoplay, mute, loop, video_path="", IMAGES=None):
+    def preview_video(self, fps_for_IMAGES, autoplay, mute, loop, video_path="", IMAGES=None,
+                      frame_format="png", png_compress_level=1, frame_workers=0):
         try:
             # Destination directory for preview videos
             dest_dir = os.path.join("output", "Bjornulf", "preview_video")
@@ -64,21 +67,13 @@ class VideoPreview:
                 # Use a unique temporary directory for this run
                 with tempfile.TemporaryDirectory(prefix="bjornulf_temp_video_") as temp_dir:
                     # Convert image tensors to files in the unique temp directory
-                    image_files = []
-                    for i, img_tensor in enumerate(IMAGES):
-                        # Convert tensor (H, W, C) in range [0, 1] to numpy array in range [0, 255]
-                        img_np = (img_tensor.numpy() * 255).astype(np.uint8)
-                        # Ensure RGB format for OpenCV (ComfyUI IMAGES are typically RGB)
-                        img_path = os.path.join(temp_dir, f"frame_{i:04d}.png")
-                        cv2.imwrite(img_path, cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR))
-                        image_files.append(img_path)
-
-                    if not image_files:
-                        raise ValueError("No valid IMAGES provided to create a video.")
+                    pattern = write_frames(
+                        IMAGES, temp_dir, name="frame_%04d", frame_format=frame_format,
+                        compress_level=png_compress_level, max_workers=frame_workers
+                    )
 
                     # Create temporary video using FFmpeg
                     output_video = os.path.join(temp_dir, "temp_video.mp4")
-                    pattern = os.path.join(temp_dir, "frame_%04d.png")
                     cmd = [
                         "ffmpeg",
                         "-framerate", str(fps_for_IMAGES),
@@ -1,5 +1,6 @@
 import { app } from "../../../scripts/app.js";
 import { api } from "../../../scripts/api.js";
+import { ComfyWidgets } from "../../../scripts/widgets.js";
 
 // Node-specific logic
 app.registerExtension({
@@ -27,7 +28,7 @@ app.registerExtension({
               if (data.value === 0) {
                 resetButton.name = "Save/Reset Context File (Empty)";
               } else {
-                resetButton.name = `Reset Context File (${data.value} lines)`;
+                resetButton.name = `Reset Context File (${data.value} messages, ~${data.tokens} tokens)`;
               }
             } else {
               console.error("[Ollama] Error in context size:", data.error);
@@ -182,6 +183,23 @@ app.registerExtension({
         }
       });
 
+      // Streaming mode: show the answer while it is generated
+      let streamWidget = null;
+      api.addEventListener("bjornulf_ollama_stream", ({ detail }) => {
+        if (String(detail.node) !== String(node.id)) return;
+        if (!streamWidget) {
+          streamWidget = ComfyWidgets["STRING"](node, "streamed_response", ["STRING", { multiline: true }], app).widget;
+          streamWidget.inputEl.readOnly = true;
+          streamWidget.serialize = false;
+        }
+        if (detail.start) {
+          streamWidget.value = "";
+        }
+        streamWidget.value += detail.text;
+        streamWidget.inputEl.scrollTop = streamWidget.inputEl.scrollHeight;
+        node.setDirtyCanvas(true);
+      });
+
       //If workflow is stopped during pause, cancel the run
       const original_api_interrupt = api.interrupt;
       api.interrupt = function () {